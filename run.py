@@ -5,6 +5,7 @@ Social Agent - Main entry point for the WhatsApp conversation analysis system.
 
 import sys
 import os
+import asyncio
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -12,4 +13,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.cli.basic import cli
 
 if __name__ == "__main__":
+    # Prefer uvloop's faster event loop where it is available (Linux/macOS)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     cli()
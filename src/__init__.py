@@ -4,18 +4,41 @@ Social Agent - Multi-Agent Framework for WhatsApp Conversation Analysis
 A sophisticated system that leverages AutoGen's multi-agent framework
 to analyze WhatsApp conversations with sentiment analysis, categorization,
 and intelligent response suggestions.
+
+The agents are asyncio-based; on Linux/macOS uvloop is the preferred event
+loop and is installed automatically by run.py when available.
 """
 
 __version__ = "1.0.0"
 __author__ = "Social Agent Development Team"
 __description__ = "Multi-agent framework for WhatsApp conversation analysis"
 
-from src.utils.config import get_settings, get_platform_config
-from src.utils.database import db_manager, init_database
-from src.utils.vector_db import get_vector_db
-from src.agents.base import get_orchestrator
-from src.agents.sentiment import SentimentAnalysisAgent
-from src.scrapers.whatsapp import WhatsAppScraper
+import importlib
+
+# Public names are resolved lazily (PEP 562) so that importing a submodule such
+# as src.cli does not pull in SQLAlchemy, ChromaDB and the agent stack up front
+_LAZY_ATTRS = {
+    "get_settings": "src.utils.config",
+    "get_platform_config": "src.utils.config",
+    "db_manager": "src.utils.database",
+    "init_database": "src.utils.database",
+    "get_vector_db": "src.utils.vector_db",
+    "get_orchestrator": "src.agents.base",
+    "SentimentAnalysisAgent": "src.agents.sentiment",
+    "WhatsAppScraper": "src.scrapers.whatsapp",
+    "WhatsAppScraperPool": "src.scrapers.whatsapp",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "get_settings",
@@ -26,4 +49,5 @@ __all__ = [
     "get_orchestrator",
     "SentimentAnalysisAgent",
     "WhatsAppScraper",
+    "WhatsAppScraperPool",
 ]
@@ -3,13 +3,15 @@ Base agent class and agent orchestrator for the Social Agent system using AutoGe
 """
 
 import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime
-import json
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime, timedelta
+import orjson
 
 # AutoGen v0.4+ imports
 from autogen_agentchat.agents import AssistantAgent, BaseChatAgent
+from autogen_agentchat.base import TaskResult
 from autogen_agentchat.teams import RoundRobinGroupChat
 
 from src.utils.logging import get_logger, log_agent_activity
@@ -18,6 +20,21 @@ from src.utils.database import db_manager
 from src.models import AgentTask, AnalysisStatus
 
 
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize to a JSON string using orjson (non-str keys such as enums are stringified)."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(obj, default=str, option=option).decode()
+
+
+# Mock LLM payload, encoded once; the response envelope is rebuilt per call
+# so callers can't mutate a shared object
+_MOCK_CONTENT = _dumps({
+    "analysis": "Mock analysis result",
+    "confidence": 0.8,
+    "status": "completed"
+})
+
+
 class BaseAgent(ABC):
     """Base class for all social media agents using AutoGen v0.3.0+."""
     
@@ -108,50 +125,104 @@ class BaseAgent(ABC):
     
     async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a task and log the results."""
+        if task_writer.is_running:
+            return await self._execute_task_queued(task_data)
+        
         task_id = task_data.get("id", "unknown")
+        # One session per asyncio task for all writes of this task; each write is its own
+        # short transaction so no connection or lock is held across the await below
+        session = db_manager.get_scoped_session()
+        task = None
+        
+        # Read the wall clock once; completion times are derived from the monotonic clock
+        started_at = datetime.utcnow()
+        started = time.monotonic()
         
         try:
             log_agent_activity(self.name, "task_started", {"task_id": task_id})
             
             # Create task record
-            with db_manager.session_scope() as session:
-                task = AgentTask(
-                    task_type=task_data.get("type", "unknown"),
-                    agent_name=self.name,
-                    status=AnalysisStatus.IN_PROGRESS,
-                    config=task_data,
-                    started_at=datetime.utcnow()
-                )
-                session.add(task)
-                session.flush()
-                task_id = task.id
+            task = AgentTask(
+                task_type=task_data.get("type", "unknown"),
+                agent_name=self.name,
+                status=AnalysisStatus.IN_PROGRESS,
+                config=task_data,
+                started_at=started_at
+            )
+            session.add(task)
+            session.commit()  # Make the IN_PROGRESS row visible and release the connection
+            task_id = task.id
             
             # Process the task
             result = await self.process(task_data)
             
-            # Update task record
-            with db_manager.session_scope() as session:
-                task = session.query(AgentTask).filter(AgentTask.id == task_id).first()
-                if task:
-                    task.status = AnalysisStatus.COMPLETED
-                    task.result = result
-                    task.completed_at = datetime.utcnow()
+            elapsed = time.monotonic() - started
             
-            log_agent_activity(self.name, "task_completed", {"task_id": task_id, "result": result})
+            # Update task record (still attached to the session and not expired on commit)
+            task.status = AnalysisStatus.COMPLETED
+            task.result = result
+            task.completed_at = started_at + timedelta(seconds=elapsed)
+            session.commit()
+            
+            log_agent_activity(self.name, "task_completed", {"task_id": task_id, "elapsed": round(elapsed, 3), "result": result})
             return result
             
         except Exception as e:
+            elapsed = time.monotonic() - started
+            
             # Update task record with error
-            with db_manager.session_scope() as session:
-                task = session.query(AgentTask).filter(AgentTask.id == task_id).first()
-                if task:
+            try:
+                if task is not None:
                     task.status = AnalysisStatus.FAILED
                     task.error_message = str(e)
-                    task.completed_at = datetime.utcnow()
+                    task.completed_at = started_at + timedelta(seconds=elapsed)
+                session.commit()
+            except Exception:
+                session.rollback()
+            
+            log_agent_activity(self.name, "task_failed", {"task_id": task_id, "error": str(e)})
+            self.logger.error(f"Task {task_id} failed: {e}")
+            raise
+        
+        finally:
+            db_manager.remove_scoped_session()
+    
+    async def _execute_task_queued(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a task and hand its finished record to the background writer."""
+        task_id = task_data.get("id", "unknown")
+        started_at = datetime.utcnow()
+        started = time.monotonic()
+        
+        task = AgentTask(
+            task_type=task_data.get("type", "unknown"),
+            agent_name=self.name,
+            config=task_data,
+            started_at=started_at
+        )
+        
+        log_agent_activity(self.name, "task_started", {"task_id": task_id})
+        
+        try:
+            result = await self.process(task_data)
+            
+        except Exception as e:
+            task.status = AnalysisStatus.FAILED
+            task.error_message = str(e)
+            task.completed_at = started_at + timedelta(seconds=time.monotonic() - started)
+            await task_writer.submit(task)
             
             log_agent_activity(self.name, "task_failed", {"task_id": task_id, "error": str(e)})
             self.logger.error(f"Task {task_id} failed: {e}")
             raise
+        
+        elapsed = time.monotonic() - started
+        task.status = AnalysisStatus.COMPLETED
+        task.result = result
+        task.completed_at = started_at + timedelta(seconds=elapsed)
+        await task_writer.submit(task)
+        
+        log_agent_activity(self.name, "task_completed", {"task_id": task_id, "elapsed": round(elapsed, 3), "result": result})
+        return result
     
     def get_status(self) -> Dict[str, Any]:
         """Get agent status."""
@@ -177,11 +248,7 @@ class MockModelClient:
         return {
             "choices": [{
                 "message": {
-                    "content": json.dumps({
-                        "analysis": "Mock analysis result",
-                        "confidence": 0.8,
-                        "status": "completed"
-                    })
+                    "content": _MOCK_CONTENT
                 }
             }]
         }
@@ -198,16 +265,77 @@ class MockLLMClient:
         return {
             "choices": [{
                 "message": {
-                    "content": json.dumps({
-                        "analysis": "Mock analysis result",
-                        "confidence": 0.8,
-                        "status": "completed"
-                    })
+                    "content": _MOCK_CONTENT
                 }
             }]
         }
 
 
+class TaskRecordWriter:
+    """Writes AgentTask records in batches from a dedicated asyncio task."""
+    
+    def __init__(self, max_batch_size: int = 500, max_queue_size: int = 10_000):
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.logger = get_logger("task_writer")
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the writer task is alive and accepting records."""
+        return self._writer_task is not None and not self._writer_task.done()
+    
+    def start(self):
+        """Start the writer task on the running event loop."""
+        if self.is_running:
+            return
+        # Bounded queue applies back-pressure to agents when the DB falls behind
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def stop(self):
+        """Flush queued records and stop the writer task."""
+        if not self.is_running:
+            return
+        await self._queue.join()
+        self._writer_task.cancel()
+        await asyncio.gather(self._writer_task, return_exceptions=True)
+        self._writer_task = None
+    
+    async def submit(self, task: AgentTask):
+        """Queue a finished task record for writing."""
+        await self._queue.put(task)
+    
+    async def _writer_loop(self):
+        """Drain the queue in batches, one transaction per batch."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                if db_manager.is_sqlite:
+                    # SQLite's StaticPool gives every thread the same connection, so a commit from
+                    # a worker would end the event loop's open transactions; the executemany is short
+                    self._write_batch(batch)
+                else:
+                    await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(batch)} task records: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch: List[AgentTask]):
+        """Insert a batch of task records."""
+        with db_manager.session_scope() as session:
+            session.add_all(batch)
+
+
 class AgentOrchestrator:
     """Orchestrates multiple agents using AutoGen v0.3.0+ RoundRobinGroupChat."""
     
@@ -217,25 +345,35 @@ class AgentOrchestrator:
         self.settings = get_settings()
         self.platform_config = get_platform_config()
         self.group_chat = None
+        self._chat_dirty = False
+        
+        # (timestamp, status) of the last status snapshot, reused for status_cache_ttl seconds
+        self.status_cache_ttl = 1.0
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
     def register_agent(self, agent: BaseAgent):
         """Register an agent with the orchestrator."""
         self.agents[agent.name] = agent
         self.logger.info(f"Registered agent: {agent.name}")
         
-        # Recreate group chat with new agent
-        self._setup_group_chat()
+        # Group chat is rebuilt lazily on next use
+        self._chat_dirty = True
+        self._status_cache = None
     
     def unregister_agent(self, agent_name: str):
         """Unregister an agent."""
         if agent_name in self.agents:
             del self.agents[agent_name]
             self.logger.info(f"Unregistered agent: {agent_name}")
-            self._setup_group_chat()
+            self._chat_dirty = True
+            self._status_cache = None
     
     def _setup_group_chat(self):
         """Set up AutoGen group chat with registered agents using v0.4+ RoundRobinGroupChat."""
+        self._chat_dirty = False
+        
         if not self.agents:
+            self.group_chat = None
             return
         
         # Get AutoGen agents
@@ -250,18 +388,25 @@ class AgentOrchestrator:
     
     async def start_all_agents(self):
         """Start all registered agents."""
+        task_writer.start()
         tasks = [agent.start() for agent in self.agents.values()]
         await asyncio.gather(*tasks)
+        self._status_cache = None
         self.logger.info("All agents started")
     
     async def stop_all_agents(self):
         """Stop all registered agents."""
         tasks = [agent.stop() for agent in self.agents.values()]
         await asyncio.gather(*tasks)
+        await task_writer.stop()
+        self._status_cache = None
         self.logger.info("All agents stopped")
     
     async def execute_collaborative_task(self, task_description: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a task that requires collaboration between agents."""
+        if self._chat_dirty:
+            self._setup_group_chat()
+        
         if not self.group_chat:
             raise ValueError("No agents registered for collaboration")
         
@@ -269,19 +414,24 @@ class AgentOrchestrator:
             # Format the task message
             message = f"""
             Task: {task_description}
-            Context: {json.dumps(context, indent=2)}
+            Context: {_dumps(context, pretty=True)}
             
             Please collaborate to analyze this data and provide comprehensive insights.
             Each agent should contribute their specialized analysis.
             Provide the final result in JSON format.
             """
             
-            # Run the group chat
-            chat_result = await self.group_chat.run(message)
+            # Stream the group chat and stop at the terminal TaskResult
+            last_message = None
+            async for event in self.group_chat.run_stream(task=message):
+                if isinstance(event, TaskResult):
+                    if event.messages:
+                        last_message = event.messages[-1]
+                    break
+                last_message = event
             
             # Extract the results from the chat
-            if hasattr(chat_result, 'messages') and chat_result.messages:
-                last_message = chat_result.messages[-1]
+            if last_message is not None:
                 return {
                     "result": last_message.content if hasattr(last_message, 'content') else str(last_message),
                     "collaboration_summary": f"Processed by {len(self.agents)} agents",
@@ -325,28 +475,33 @@ class AgentOrchestrator:
     async def process_whatsapp_message(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process a WhatsApp message through multiple agents."""
         try:
-            results = {}
+            # The analyses are independent, so run them concurrently
+            jobs = {}
             
             # Sentiment analysis
             if self.settings.sentiment_analysis_enabled:
                 sentiment_agent = self.agents.get("SentimentAnalysisAgent")
                 if sentiment_agent:
-                    sentiment_result = await sentiment_agent.process(message_data)
-                    results["sentiment"] = sentiment_result
+                    jobs["sentiment"] = sentiment_agent.process(message_data)
             
             # Message categorization
             if self.settings.categorization_enabled:
                 categorization_agent = self.agents.get("MessageCategorizationAgent")
                 if categorization_agent:
-                    category_result = await categorization_agent.process(message_data)
-                    results["categorization"] = category_result
+                    jobs["categorization"] = categorization_agent.process(message_data)
             
             # Response suggestions
             if self.settings.response_suggestions_enabled:
                 response_agent = self.agents.get("ResponseSuggestionAgent")
                 if response_agent:
-                    response_result = await response_agent.process(message_data)
-                    results["response_suggestion"] = response_result
+                    jobs["response_suggestion"] = response_agent.process(message_data)
+            
+            outcomes = await asyncio.gather(*jobs.values(), return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    raise outcome
+            
+            results = dict(zip(jobs.keys(), outcomes))
             
             return {
                 "message_id": message_data.get("id", "unknown"),
@@ -358,17 +513,36 @@ class AgentOrchestrator:
             self.logger.error(f"Error processing WhatsApp message: {e}")
             return {"error": str(e), "message_id": message_data.get("id", "unknown")}
     
-    def get_orchestrator_status(self) -> Dict[str, Any]:
-        """Get orchestrator status."""
-        return {
+    async def process_whatsapp_messages(self, messages: List[Dict[str, Any]], max_concurrent: int = 1000) -> List[Dict[str, Any]]:
+        """Process a batch of WhatsApp messages concurrently, preserving input order."""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def _process(message_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_whatsapp_message(message_data)
+        
+        return await asyncio.gather(*(_process(message_data) for message_data in messages))
+    
+    def get_orchestrator_status(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Get orchestrator status, reusing a snapshot younger than status_cache_ttl."""
+        now = time.monotonic()
+        if use_cache and self._status_cache and now - self._status_cache[0] < self.status_cache_ttl:
+            return self._status_cache[1]
+        
+        status = {
             "total_agents": len(self.agents),
             "running_agents": sum(1 for agent in self.agents.values() if agent.is_running),
             "agents": [agent.get_status() for agent in self.agents.values()],
             "enabled_platforms": self.platform_config.get_enabled_platforms(),
             "autogen_version": "0.3.0+",
-            "group_chat_active": self.group_chat is not None
+            "group_chat_active": bool(self.agents) if self._chat_dirty else self.group_chat is not None
         }
+        self._status_cache = (now, status)
+        return status
+
 
+# Global task record writer, started and stopped with the agents
+task_writer = TaskRecordWriter()
 
 # Global orchestrator instance
 orchestrator = AgentOrchestrator()
@@ -2,16 +2,92 @@
 Sentiment Analysis Agent for analyzing social media posts.
 """
 
+import asyncio
+import os
 import re
-from typing import Dict, Any, List
-from textblob import TextBlob
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import numpy as np
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from src.agents.base import BaseAgent
+from src.utils.config import get_settings
 from src.utils.helpers import clean_text, TextProcessor
 from src.models import SentimentType
 
 
+# Precompiled patterns used on the per-message hot path
+_RT_RE = re.compile(r'\bRT\b')
+_URL_RE = re.compile(r'http[s]?://\S+')
+_BANG_RE = re.compile(r'[!]{2,}')
+_Q_RE = re.compile(r'[?]{2,}')
+_TAG_RE = re.compile(r'[@#](\w+)')
+_EMOJI_RE = re.compile('[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]')
+_CAPS_RE = re.compile(r'[A-Z]{3,}')
+
+SARCASM_INDICATORS = [
+    "yeah right", "sure", "obviously", "totally", "definitely",
+    "great job", "brilliant", "fantastic", "amazing"
+]
+_SARCASM_RE = re.compile("|".join(re.escape(indicator) for indicator in SARCASM_INDICATORS))
+
+# VADER loads its lexicon from disk on construction; share one read-only instance
+_VADER = SentimentIntensityAnalyzer()
+
+# Integer sentiment codes used by the vectorized batch path
+_SENTIMENT_BY_CODE = {
+    1: SentimentType.POSITIVE,
+    -1: SentimentType.NEGATIVE,
+    0: SentimentType.NEUTRAL,
+}
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _ScoreCache:
+    """Thread-safe LRU of text scores shared by all sentiment agents."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[tuple]:
+        """Get a cached value, marking it as recently used."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+    
+    def put(self, key: tuple, value: tuple):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def info(self) -> CacheInfo:
+        """Get hit/miss statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+@lru_cache(maxsize=1)
+def _get_score_cache() -> _ScoreCache:
+    """Get the shared score cache, sized from settings on first use rather than at import."""
+    return _ScoreCache(maxsize=get_settings().cache_size)
+
+
 class SentimentAnalysisAgent(BaseAgent):
     """Agent specialized in sentiment analysis of social media content."""
     
@@ -22,15 +98,27 @@ class SentimentAnalysisAgent(BaseAgent):
         )
         
         # Initialize sentiment analyzers
-        self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.vader_analyzer = _VADER
         self.text_processor = TextProcessor()
         
         # Sentiment thresholds
         self.positive_threshold = 0.1
         self.negative_threshold = -0.1
+        
+        # TextBlob is much slower than VADER and opt-in; VADER alone is tuned for social text
+        self.use_textblob = self.settings.use_textblob
+        
+        # Scores of repeated texts ("ok", "thanks", forwarded messages) are
+        # cached in a store shared by every sentiment agent
+        self.score_cache = _get_score_cache()
+        self.cache_max_text_length = 1000
     
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Process sentiment analysis for given text data."""
+        return self._process_sync(data)
+    
+    def _process_sync(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous sentiment pipeline, safe to run in a worker thread."""
         text = data.get("text", "")
         post_id = data.get("post_id", "unknown")
         platform = data.get("platform", "unknown")
@@ -41,16 +129,49 @@ class SentimentAnalysisAgent(BaseAgent):
                 "post_id": post_id
             }
         
+        cleaned_text, textblob_sentiment, vader_sentiment = self._score(text, platform)
+        
+        # Combine results and determine final sentiment
+        combined_sentiment = self._combine_sentiments(textblob_sentiment, vader_sentiment)
+        
+        return self._build_result(post_id, platform, text, cleaned_text, textblob_sentiment, vader_sentiment, combined_sentiment)
+    
+    def _score(self, text: str, platform: str) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Score a text, going through the cache for short texts."""
+        # Long texts rarely repeat, so keep them out of the cache
+        if len(text) > self.cache_max_text_length:
+            return self._score_text(text, platform)
+        
+        # Everything the scores depend on besides the text is part of the key
+        key = (text, platform, self.use_textblob, self.positive_threshold, self.negative_threshold)
+        scored = self.score_cache.get(key)
+        if scored is None:
+            scored = self._score_text(text, platform)
+            self.score_cache.put(key, scored)
+        return scored
+    
+    def _score_text(self, text: str, platform: str) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Preprocess a text and run the sentiment analyzers on it."""
         # Clean and preprocess text
         cleaned_text = self._preprocess_text(text, platform)
         
         # Perform sentiment analysis using multiple methods
-        textblob_sentiment = self._analyze_with_textblob(cleaned_text)
+        textblob_sentiment = self._analyze_with_textblob(cleaned_text) if self.use_textblob else None
         vader_sentiment = self._analyze_with_vader(cleaned_text)
         
-        # Combine results and determine final sentiment
-        combined_sentiment = self._combine_sentiments(textblob_sentiment, vader_sentiment)
-        
+        return cleaned_text, textblob_sentiment, vader_sentiment
+    
+    def _build_result(
+        self,
+        post_id: str,
+        platform: str,
+        text: str,
+        cleaned_text: str,
+        textblob_sentiment: Optional[Dict[str, Any]],
+        vader_sentiment: Dict[str, Any],
+        combined_sentiment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Assemble the result dict for a post."""
         # Extract additional insights
         insights = self._extract_insights(text, combined_sentiment)
         
@@ -60,9 +181,10 @@ class SentimentAnalysisAgent(BaseAgent):
             "sentiment": combined_sentiment["sentiment"],
             "confidence": combined_sentiment["confidence"],
             "score": combined_sentiment["score"],
+            # The analyzer dicts may be cached and shared, so each result gets its own copies
             "detailed_analysis": {
-                "textblob": textblob_sentiment,
-                "vader": vader_sentiment,
+                "textblob": dict(textblob_sentiment) if textblob_sentiment is not None else None,
+                "vader": dict(vader_sentiment),
                 "combined": combined_sentiment
             },
             "insights": insights,
@@ -72,32 +194,46 @@ class SentimentAnalysisAgent(BaseAgent):
         self.logger.info(f"Sentiment analysis completed for post {post_id}: {combined_sentiment['sentiment']}")
         return result
     
+    def cache_info(self) -> "CacheInfo":
+        """Get hit/miss statistics for the shared scoring cache."""
+        return self.score_cache.info()
+    
     def _preprocess_text(self, text: str, platform: str) -> str:
         """Preprocess text for sentiment analysis."""
         # Clean basic text
         cleaned = clean_text(text)
         
+        # Each regex pass is guarded by a cheap substring check so that
+        # plain messages skip the passes that cannot match
+        
         # Remove platform-specific elements that might skew sentiment
-        if platform.lower() == "twitter":
+        if "RT" in cleaned and platform.lower() == "twitter":
             # Remove RT indicator
-            cleaned = re.sub(r'\bRT\b', '', cleaned)
+            cleaned = _RT_RE.sub('', cleaned)
         
         # Remove URLs (they don't contribute to sentiment)
-        cleaned = re.sub(r'http[s]?://\S+', '', cleaned)
+        if "://" in cleaned:
+            cleaned = _URL_RE.sub('', cleaned)
         
         # Remove excessive punctuation
-        cleaned = re.sub(r'[!]{2,}', '!', cleaned)
-        cleaned = re.sub(r'[?]{2,}', '?', cleaned)
+        if "!!" in cleaned:
+            cleaned = _BANG_RE.sub('!', cleaned)
+        if "??" in cleaned:
+            cleaned = _Q_RE.sub('?', cleaned)
         
         # Remove mentions and hashtags for cleaner sentiment analysis
         # but keep the words for context
-        cleaned = re.sub(r'[@#](\w+)', r'\1', cleaned)
+        if "@" in cleaned or "#" in cleaned:
+            cleaned = _TAG_RE.sub(r'\1', cleaned)
         
         return cleaned.strip()
     
     def _analyze_with_textblob(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment using TextBlob."""
         try:
+            # Imported on first use: TextBlob pulls in NLTK (~1s) and is opt-in
+            from textblob import TextBlob
+            
             blob = TextBlob(text)
             polarity = blob.sentiment.polarity  # -1 to 1
             subjectivity = blob.sentiment.subjectivity  # 0 to 1
@@ -160,17 +296,29 @@ class SentimentAnalysisAgent(BaseAgent):
                 "error": str(e)
             }
     
-    def _combine_sentiments(self, textblob_result: Dict[str, Any], vader_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _combine_sentiments(self, textblob_result: Optional[Dict[str, Any]], vader_result: Dict[str, Any]) -> Dict[str, Any]:
         """Combine results from multiple sentiment analyzers."""
-        # Weight the different methods
-        textblob_weight = 0.4
-        vader_weight = 0.6
-        
-        # Calculate weighted score
-        textblob_score = textblob_result.get("polarity", 0)
         vader_score = vader_result.get("compound", 0)
+        vader_confidence = vader_result.get("confidence", 0)
         
-        combined_score = (textblob_score * textblob_weight) + (vader_score * vader_weight)
+        if textblob_result is None:
+            # TextBlob disabled: VADER carries the full weight
+            combined_score = vader_score
+            combined_confidence = vader_confidence
+            agreement = True
+        else:
+            # Weight the different methods
+            textblob_weight = 0.4
+            vader_weight = 0.6
+            
+            # Calculate weighted score
+            textblob_score = textblob_result.get("polarity", 0)
+            combined_score = (textblob_score * textblob_weight) + (vader_score * vader_weight)
+            
+            # Calculate confidence as average of individual confidences
+            textblob_confidence = textblob_result.get("confidence", 0)
+            combined_confidence = (textblob_confidence + vader_confidence) / 2
+            agreement = textblob_result.get("sentiment") == vader_result.get("sentiment")
         
         # Determine final sentiment
         if combined_score > self.positive_threshold:
@@ -180,36 +328,38 @@ class SentimentAnalysisAgent(BaseAgent):
         else:
             final_sentiment = SentimentType.NEUTRAL
         
-        # Calculate confidence as average of individual confidences
-        textblob_confidence = textblob_result.get("confidence", 0)
-        vader_confidence = vader_result.get("confidence", 0)
-        combined_confidence = (textblob_confidence + vader_confidence) / 2
-        
         return {
             "sentiment": final_sentiment,
             "score": combined_score,
             "confidence": combined_confidence,
-            "agreement": textblob_result.get("sentiment") == vader_result.get("sentiment")
+            "agreement": agreement
         }
     
+    def _combine_batch(self, textblob_polarity: np.ndarray, vader_compound: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized counterpart of _combine_sentiments returning scores and sentiment codes (1, -1, 0)."""
+        if self.use_textblob:
+            scores = (textblob_polarity * 0.4) + (vader_compound * 0.6)
+        else:
+            scores = vader_compound
+        
+        codes = np.where(
+            scores > self.positive_threshold, 1,
+            np.where(scores < self.negative_threshold, -1, 0)
+        )
+        return scores, codes
+    
     def _extract_insights(self, original_text: str, sentiment_result: Dict[str, Any]) -> Dict[str, Any]:
         """Extract additional insights from the sentiment analysis."""
         insights = {
             "word_count": len(original_text.split()),
-            "has_emojis": bool(re.search(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]', original_text)),
-            "has_caps": bool(re.search(r'[A-Z]{3,}', original_text)),
+            "has_emojis": bool(_EMOJI_RE.search(original_text)),
+            "has_caps": bool(_CAPS_RE.search(original_text)),
             "has_exclamation": '!' in original_text,
             "has_question": '?' in original_text,
         }
         
-        # Detect potential sarcasm indicators
-        sarcasm_indicators = [
-            "yeah right", "sure", "obviously", "totally", "definitely",
-            "great job", "brilliant", "fantastic", "amazing"
-        ]
-        
-        text_lower = original_text.lower()
-        insights["potential_sarcasm"] = any(indicator in text_lower for indicator in sarcasm_indicators)
+        # Detect potential sarcasm indicators in a single scan
+        insights["potential_sarcasm"] = bool(_SARCASM_RE.search(original_text.lower()))
         
         # Emotional intensity
         if sentiment_result["sentiment"] != SentimentType.NEUTRAL:
@@ -226,20 +376,85 @@ class SentimentAnalysisAgent(BaseAgent):
     
     async def analyze_batch(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Analyze sentiment for a batch of posts."""
-        results = []
+        # Bound the number of posts in flight so the thread pool isn't flooded
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+        
+        async def _score(post: Dict[str, Any]):
+            text = post.get("text", "")
+            if not text:
+                return None
+            async with semaphore:
+                return await asyncio.to_thread(self._score, text, post.get("platform", "unknown"))
         
-        for post in posts:
-            try:
-                result = await self.process(post)
-                results.append(result)
-            except Exception as e:
-                self.logger.error(f"Failed to analyze post {post.get('post_id', 'unknown')}: {e}")
+        outcomes = await asyncio.gather(*(_score(post) for post in posts), return_exceptions=True)
+        
+        # Combine all successfully scored posts in one vectorized pass
+        scored = [i for i, outcome in enumerate(outcomes) if isinstance(outcome, tuple)]
+        textblob_polarity = np.fromiter(
+            ((outcomes[i][1] or {}).get("polarity", 0) for i in scored), dtype=np.float64, count=len(scored)
+        )
+        vader_compound = np.fromiter(
+            (outcomes[i][2].get("compound", 0) for i in scored), dtype=np.float64, count=len(scored)
+        )
+        scores, codes = self._combine_batch(textblob_polarity, vader_compound)
+        combined_by_index = dict(zip(scored, zip(scores.tolist(), codes.tolist())))
+        
+        results = []
+        for i, (post, outcome) in enumerate(zip(posts, outcomes)):
+            post_id = post.get("post_id", "unknown")
+            
+            if outcome is None:
                 results.append({
-                    "post_id": post.get("post_id", "unknown"),
-                    "error": str(e),
+                    "error": "No text provided for sentiment analysis",
+                    "post_id": post_id
+                })
+            elif isinstance(outcome, Exception):
+                self.logger.error(f"Failed to analyze post {post_id}: {outcome}")
+                results.append({
+                    "post_id": post_id,
+                    "error": str(outcome),
                     "sentiment": SentimentType.NEUTRAL,
                     "confidence": 0.0
                 })
+            else:
+                cleaned_text, textblob_sentiment, vader_sentiment = outcome
+                score, code = combined_by_index[i]
+                
+                vader_confidence = vader_sentiment.get("confidence", 0)
+                if textblob_sentiment is None:
+                    confidence = vader_confidence
+                    agreement = True
+                else:
+                    confidence = (textblob_sentiment.get("confidence", 0) + vader_confidence) / 2
+                    agreement = textblob_sentiment.get("sentiment") == vader_sentiment.get("sentiment")
+                
+                combined_sentiment = {
+                    "sentiment": _SENTIMENT_BY_CODE[code],
+                    "score": score,
+                    "confidence": confidence,
+                    "agreement": agreement
+                }
+                results.append(self._build_result(
+                    post_id, post.get("platform", "unknown"), post.get("text", ""),
+                    cleaned_text, textblob_sentiment, vader_sentiment, combined_sentiment
+                ))
+        
+        return results
+    
+    async def process_batch(
+        self,
+        items: List[Dict[str, Any]],
+        batch_size: int = 32,
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze items chunk by chunk, reporting the size of each finished chunk."""
+        results = []
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            results.extend(await self.analyze_batch(chunk))
+            
+            if on_progress:
+                on_progress(len(chunk))
         
         return results
     
@@ -249,24 +464,21 @@ class SentimentAnalysisAgent(BaseAgent):
             return {"error": "No results to summarize"}
         
         total_posts = len(results)
-        sentiment_counts = {
-            SentimentType.POSITIVE: 0,
-            SentimentType.NEGATIVE: 0,
-            SentimentType.NEUTRAL: 0
-        }
-        
-        total_confidence = 0
-        successful_analyses = 0
         
+        # One pass accumulates the distribution and confidence total of successful results
+        counts = Counter()
+        confidence_sum = 0.0
         for result in results:
             if "error" not in result:
-                sentiment = result.get("sentiment")
-                if sentiment in sentiment_counts:
-                    sentiment_counts[sentiment] += 1
-                
-                confidence = result.get("confidence", 0)
-                total_confidence += confidence
-                successful_analyses += 1
+                counts[result.get("sentiment")] += 1
+                confidence_sum += result.get("confidence", 0)
+        
+        successful_analyses = sum(counts.values())
+        sentiment_counts = {
+            SentimentType.POSITIVE: counts[SentimentType.POSITIVE],
+            SentimentType.NEGATIVE: counts[SentimentType.NEGATIVE],
+            SentimentType.NEUTRAL: counts[SentimentType.NEUTRAL]
+        }
         
         # Calculate percentages
         sentiment_percentages = {
@@ -275,7 +487,7 @@ class SentimentAnalysisAgent(BaseAgent):
         }
         
         # Average confidence
-        avg_confidence = total_confidence / successful_analyses if successful_analyses > 0 else 0
+        avg_confidence = confidence_sum / successful_analyses if successful_analyses else 0
         
         return {
             "total_posts": total_posts,
@@ -2,26 +2,31 @@
 Command Line Interface for Social Agent - WhatsApp Conversation Analysis System.
 """
 
-import asyncio
 import click
-import json
-from typing import Dict, Any
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from datetime import datetime
 
-from src.utils.config import get_settings, get_platform_config
-from src.utils.database import init_database, db_manager
-from src.utils.vector_db import get_vector_db
-from src.utils.logging import get_logger
-from src.scrapers.whatsapp import WhatsAppScraper
-from src.agents.sentiment import SentimentAnalysisAgent
-from src.agents.base import get_orchestrator
+# Heavy dependencies (Rich, SQLAlchemy, ChromaDB, the agent stack) are imported
+# inside the commands that need them so that --help and --version stay fast
+_console = None
 
-console = Console()
-logger = get_logger("cli")
+
+def get_console():
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        # Output is styled explicitly, so skip Rich's per-string regex highlighter
+        _console = Console(highlight=False)
+    return _console
+
+
+def __getattr__(name):
+    # Keep the old module-level ``console`` and ``logger`` attributes importable
+    if name == "console":
+        return get_console()
+    if name == "logger":
+        from src.utils.logging import get_logger
+        return get_logger("cli")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @click.group()
@@ -34,6 +39,13 @@ def cli():
 @cli.command()
 def init():
     """Initialize the Social Agent system."""
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from src.utils.config import get_platform_config
+    from src.utils.database import init_database
+    from src.utils.vector_db import get_vector_db
+    
+    console = get_console()
     console.print(Panel("🚀 Initializing Social Agent System", style="bold blue"))
     
     try:
@@ -56,7 +68,6 @@ def init():
             
             # Check configuration
             task3 = progress.add_task("Checking configuration...", total=None)
-            settings = get_settings()
             platform_config = get_platform_config()
             enabled_platforms = platform_config.get_enabled_platforms()
             progress.update(task3, description="✅ Configuration loaded")
@@ -71,12 +82,17 @@ def init():
     
     except Exception as e:
         console.print(f"\n❌ Initialization failed: {e}", style="bold red")
-        logger.error(f"Initialization failed: {e}")
+        from src.utils.logging import get_logger
+        get_logger("cli").error(f"Initialization failed: {e}")
 
 
 @cli.command()
 def config():
     """Show current configuration."""
+    from rich.panel import Panel
+    from src.utils.config import get_settings, get_platform_config
+    
+    console = get_console()
     console.print(Panel("⚙️  Current Configuration", style="bold cyan"))
     
     try:
@@ -2,29 +2,65 @@
 Command Line Interface for the Social Agent system.
 """
 
-import asyncio
-import json
-from typing import List, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 import click
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import print as rprint
 
-from src.utils.config import get_settings, get_platform_config
-from src.utils.database import db_manager, init_database
-from src.utils.logging import get_logger
-from src.agents.base import get_orchestrator
-from src.agents.sentiment import SentimentAnalysisAgent
-from src.scrapers.twitter import TwitterScraper
-from src.models import SocialMediaAccount, SocialMediaPost, AnalysisResult
+# Heavy dependencies (Rich, SQLAlchemy, the agent stack and scrapers) are
+# imported inside the commands that need them so that --help stays fast
+_console = None
 
 
-console = Console()
-logger = get_logger("cli")
+def get_console():
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        # Output is styled explicitly, so skip Rich's per-string regex highlighter
+        _console = Console(highlight=False)
+    return _console
+
+
+def rprint(*objects):
+    """Print Rich markup through the shared console."""
+    get_console().print(*objects)
+
+
+def run_async(coro):
+    """Run a command coroutine on the invocation's shared event loop.
+    
+    The loop (uvloop when installed) is created on first use, reused by any
+    further async work in the same invocation and closed when the root Click
+    context closes. asyncio is only imported by commands that need it.
+    """
+    import asyncio
+    
+    ctx = click.get_current_context().find_root()
+    runner = ctx.meta.get("social_agent.runner")
+    if runner is None:
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            loop_factory = None
+        
+        runner = asyncio.Runner(loop_factory=loop_factory)
+        ctx.meta["social_agent.runner"] = runner
+        ctx.call_on_close(runner.close)
+    
+    return runner.run(coro)
+
+
+def __getattr__(name):
+    # Keep the old module-level ``console`` and ``logger`` attributes importable
+    if name == "console":
+        return get_console()
+    if name == "logger":
+        from src.utils.logging import get_logger
+        return get_logger("cli")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @click.group()
@@ -32,12 +68,15 @@ logger = get_logger("cli")
 def cli(verbose):
     """Social Agent - Multi-Agent Social Media Analytics System."""
     if verbose:
-        logger.setLevel("DEBUG")
+        from src.utils.logging import get_logger
+        get_logger("cli").setLevel("DEBUG")
 
 
 @cli.command()
 def init():
     """Initialize the database and system."""
+    from src.utils.database import init_database
+    
     try:
         init_database()
         rprint("[green]✓[/green] Database initialized successfully!")
@@ -46,9 +85,15 @@ def init():
 
 
 @cli.command()
-def status():
+@click.option('--no-cache', is_flag=True, help='Re-read agent status instead of using the last snapshot')
+def status(no_cache):
     """Show system status."""
-    settings = get_settings()
+    from rich.table import Table
+    from src.utils.config import get_platform_config
+    from src.utils.database import db_manager
+    from src.agents.base import get_orchestrator
+    from src.models import SocialMediaAccount, SocialMediaPost, AnalysisResult
+    
     platform_config = get_platform_config()
     orchestrator = get_orchestrator()
     
@@ -82,14 +127,14 @@ def status():
         table.add_row(f"{platform.title()}", f"{status_icon} {status_text}", "")
     
     # Agent status
-    orchestrator_status = orchestrator.get_orchestrator_status()
+    orchestrator_status = orchestrator.get_orchestrator_status(use_cache=not no_cache)
     table.add_row(
         "Agents",
         f"✓ {orchestrator_status['running_agents']}/{orchestrator_status['total_agents']} running",
         ""
     )
     
-    console.print(table)
+    get_console().print(table)
 
 
 @cli.group()
@@ -99,10 +144,14 @@ def agents():
 
 
 @agents.command('list')
-def list_agents():
+@click.option('--no-cache', is_flag=True, help='Re-read agent status instead of using the last snapshot')
+def list_agents(no_cache):
     """List all registered agents."""
+    from rich.table import Table
+    from src.agents.base import get_orchestrator
+    
     orchestrator = get_orchestrator()
-    status = orchestrator.get_orchestrator_status()
+    status = orchestrator.get_orchestrator_status(use_cache=not no_cache)
     
     if not status['agents']:
         rprint("[yellow]No agents registered[/yellow]")
@@ -123,12 +172,15 @@ def list_agents():
             str(agent_info['tasks_count'])
         )
     
-    console.print(table)
+    get_console().print(table)
 
 
 @agents.command('start')
 def start_agents():
     """Start all agents."""
+    from src.agents.base import get_orchestrator
+    from src.agents.sentiment import SentimentAnalysisAgent
+    
     async def _start():
         orchestrator = get_orchestrator()
         
@@ -139,18 +191,20 @@ def start_agents():
         await orchestrator.start_all_agents()
         rprint("[green]✓[/green] All agents started successfully!")
     
-    asyncio.run(_start())
+    run_async(_start())
 
 
 @agents.command('stop')
 def stop_agents():
     """Stop all agents."""
+    from src.agents.base import get_orchestrator
+    
     async def _stop():
         orchestrator = get_orchestrator()
         await orchestrator.stop_all_agents()
         rprint("[green]✓[/green] All agents stopped successfully!")
     
-    asyncio.run(_stop())
+    run_async(_stop())
 
 
 @cli.group()
@@ -167,112 +221,243 @@ def scrape():
 @click.option('--analyze', '-a', is_flag=True, help='Run sentiment analysis on scraped tweets')
 def scrape_twitter(username, query, max_tweets, days_back, analyze):
     """Scrape tweets from Twitter."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from src.utils.database import db_manager
+    from src.scrapers.twitter import TwitterScraper
+    
     async def _scrape():
+        import asyncio
+        
         scraper = TwitterScraper()
         
         if not scraper.is_configured():
             rprint("[red]✗[/red] Twitter API not configured. Please check your credentials.")
             return
         
-        tweets_data = []
+        if username:
+            description = f"Scraping tweets from @{username}..."
+            batches = scraper.stream_user_tweets(username, max_tweets, days_back)
+        elif query:
+            description = f"Searching tweets for '{query}'..."
+            batches = scraper.stream_search_tweets(query, max_tweets, days_back)
+        else:
+            rprint("[red]✗[/red] Please provide either --username or --query")
+            return
+        
+        sentiment_agent = await _start_sentiment_agent() if analyze else None
+        scraped_count = 0
+        stored_count = 0
+        results = []
+        
+        # The next page is fetched while the previous one is stored and analyzed;
+        # the small queue keeps at most a couple of pages in memory
+        queue = asyncio.Queue(maxsize=2)
+        
+        async def _produce():
+            try:
+                async for batch in batches:
+                    await queue.put(batch)
+            finally:
+                await queue.put(None)
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console,
+            console=get_console(),
         ) as progress:
             
-            if username:
-                task = progress.add_task(f"Scraping tweets from @{username}...", total=None)
-                tweets_data = await scraper.scrape_user_tweets(username, max_tweets, days_back)
-            elif query:
-                task = progress.add_task(f"Searching tweets for '{query}'...", total=None)
-                tweets_data = await scraper.search_tweets(query, max_tweets, days_back)
-            else:
-                rprint("[red]✗[/red] Please provide either --username or --query")
-                return
-            
-            progress.update(task, completed=True)
+            task = progress.add_task(description, total=None)
+            producer = asyncio.create_task(_produce())
+            try:
+                while (batch := await queue.get()) is not None:
+                    with db_manager.session_scope() as session:
+                        new_count, post_id_map = _store_new_posts(session, batch)
+                    
+                    scraped_count += len(batch)
+                    stored_count += new_count
+                    
+                    if sentiment_agent:
+                        results.extend(await _analyze_and_store(sentiment_agent, batch, post_id_map))
+                    
+                    progress.update(task, description=f"{description} {scraped_count} tweets")
+                
+                # Surface scraping errors raised after the last batch
+                await producer
+            finally:
+                producer.cancel()
         
-        if not tweets_data:
+        if not scraped_count:
             rprint("[yellow]No tweets found[/yellow]")
             return
         
-        # Store tweets in database
-        with db_manager.session_scope() as session:
-            stored_count = 0
-            for tweet_data in tweets_data:
-                # Check if tweet already exists
-                existing = session.query(SocialMediaPost).filter(
-                    SocialMediaPost.platform == tweet_data["platform"],
-                    SocialMediaPost.post_id == tweet_data["post_id"]
-                ).first()
-                
-                if not existing:
-                    post = SocialMediaPost(**tweet_data)
-                    session.add(post)
-                    stored_count += 1
-            
-            session.commit()
-        
-        rprint(f"[green]✓[/green] Scraped {len(tweets_data)} tweets, stored {stored_count} new tweets")
+        rprint(f"[green]✓[/green] Scraped {scraped_count} tweets, stored {stored_count} new tweets")
         
-        # Run sentiment analysis if requested
-        if analyze and tweets_data:
-            await _analyze_tweets(tweets_data)
+        # Show the sentiment summary if analysis was requested
+        if sentiment_agent:
+            summary = await sentiment_agent.get_sentiment_summary(results)
+            _display_sentiment_summary(summary)
     
-    asyncio.run(_scrape())
+    run_async(_scrape())
 
 
-async def _analyze_tweets(tweets_data):
-    """Analyze tweets with sentiment analysis."""
-    orchestrator = get_orchestrator()
+def _post_key(platform, post_id):
+    """Normalize a (platform, post_id) pair so enum and string values compare equal."""
+    return (getattr(platform, "value", platform), str(post_id))
+
+
+def _lookup_post_ids(session, posts_data) -> dict:
+    """Map the (platform, post_id) keys of stored posts to their row ids in one query."""
+    from sqlalchemy import select, tuple_
+    from src.models import SocialMediaPost
+    
+    keys = list({_post_key(post_data["platform"], post_data["post_id"]) for post_data in posts_data})
+    if not keys:
+        return {}
+    
+    rows = session.execute(
+        select(SocialMediaPost.id, SocialMediaPost.platform, SocialMediaPost.post_id).where(
+            tuple_(SocialMediaPost.platform, SocialMediaPost.post_id).in_(keys)
+        )
+    ).all()
+    return {_post_key(platform, post_id): row_id for row_id, platform, post_id in rows}
+
+
+@lru_cache(maxsize=None)
+def _skip_duplicates_insert(engine):
+    """INSERT ... ON CONFLICT DO NOTHING for posts, or None where the database can't take it."""
+    from sqlalchemy import inspect
+    from src.models import SocialMediaPost
+    
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    
+    # create_all doesn't alter existing tables, so older installs lack the (platform, post_id) constraint
+    constraints = inspect(engine).get_unique_constraints(SocialMediaPost.__tablename__)
+    if not any(set(constraint["column_names"]) == {"platform", "post_id"} for constraint in constraints):
+        return None
+    
+    return insert(SocialMediaPost).on_conflict_do_nothing(
+        index_elements=[SocialMediaPost.platform, SocialMediaPost.post_id]
+    )
+
+
+def _store_new_posts(session, posts_data) -> Tuple[int, Dict[tuple, int]]:
+    """Insert the posts that are not stored yet.
+    
+    Returns how many posts were added and the row id of every post in the batch.
+    """
+    from sqlalchemy import insert
+    from src.models import SocialMediaPost
+    
+    # One lookup for every key instead of a SELECT per post
+    post_ids = _lookup_post_ids(session, posts_data)
+    
+    new_posts = {}
+    for post_data in posts_data:
+        key = _post_key(post_data["platform"], post_data["post_id"])
+        if key not in post_ids:
+            new_posts.setdefault(key, post_data)
+    
+    if not new_posts:
+        return 0, post_ids
+    
+    statement = _skip_duplicates_insert(session.get_bind())
+    if statement is None:
+        statement = insert(SocialMediaPost)
+    
+    inserted = session.execute(
+        statement.returning(SocialMediaPost.id, SocialMediaPost.platform, SocialMediaPost.post_id),
+        [post.as_dict() if hasattr(post, "as_dict") else post for post in new_posts.values()]
+    )
+    inserted_ids = {_post_key(platform, post_id): row_id for row_id, platform, post_id in inserted}
+    post_ids.update(inserted_ids)
+    
+    # Posts a concurrent run stored between the lookup and the insert were skipped by ON CONFLICT
+    post_ids.update(_lookup_post_ids(session, [post for key, post in new_posts.items() if key not in inserted_ids]))
+    
+    return len(inserted_ids), post_ids
+
+
+async def _start_sentiment_agent():
+    """Register and start a sentiment analysis agent for this command."""
+    from src.agents.base import get_orchestrator
+    from src.agents.sentiment import SentimentAnalysisAgent
     
-    # Start sentiment agent if not running
     sentiment_agent = SentimentAnalysisAgent()
-    orchestrator.register_agent(sentiment_agent)
+    get_orchestrator().register_agent(sentiment_agent)
     await sentiment_agent.start()
+    return sentiment_agent
+
+
+async def _analyze_and_store(sentiment_agent, tweets_data, post_id_map: Optional[Dict[tuple, int]] = None, on_progress=None):
+    """Analyze tweets and store their results in one transaction, returning the results.
+    
+    ``post_id_map`` maps (platform, post_id) keys to stored row ids; it is looked
+    up from the database when not given.
+    """
+    from sqlalchemy import insert
+    from src.utils.database import db_manager
+    from src.models import AnalysisResult
+    
+    results = await sentiment_agent.process_batch(
+        [
+            {
+                "text": tweet.get("content", ""),
+                "post_id": tweet.get("post_id"),
+                "platform": tweet.get("platform")
+            }
+            for tweet in tweets_data
+        ],
+        on_progress=on_progress
+    )
+    
+    with db_manager.session_scope() as session:
+        post_ids = post_id_map if post_id_map is not None else _lookup_post_ids(session, tweets_data)
+        completed_at = datetime.utcnow()
+        
+        rows = []
+        for tweet, result in zip(tweets_data, results):
+            post_id = post_ids.get(_post_key(tweet["platform"], tweet["post_id"]))
+            if post_id is not None:
+                rows.append({
+                    "post_id": post_id,
+                    "analysis_type": "sentiment_analysis",
+                    "status": "completed",
+                    "score": result.get("score", 0),
+                    "category": result.get("sentiment"),
+                    "confidence": result.get("confidence", 0),
+                    "results": result,
+                    "completed_at": completed_at
+                })
+        
+        # executemany INSERT, skipping the per-object unit of work
+        if rows:
+            session.execute(insert(AnalysisResult), rows)
+    
+    return results
+
+
+async def _analyze_tweets(tweets_data, post_id_map: Optional[Dict[tuple, int]] = None):
+    """Analyze tweets with sentiment analysis."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    sentiment_agent = await _start_sentiment_agent()
     
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        console=console,
+        console=get_console(),
     ) as progress:
         
         task = progress.add_task("Analyzing sentiment...", total=len(tweets_data))
-        
-        results = []
-        for i, tweet in enumerate(tweets_data):
-            analysis_data = {
-                "text": tweet.get("content", ""),
-                "post_id": tweet.get("post_id"),
-                "platform": tweet.get("platform")
-            }
-            
-            result = await sentiment_agent.process(analysis_data)
-            results.append(result)
-            
-            # Store analysis result
-            with db_manager.session_scope() as session:
-                post = session.query(SocialMediaPost).filter(
-                    SocialMediaPost.platform == tweet["platform"],
-                    SocialMediaPost.post_id == tweet["post_id"]
-                ).first()
-                
-                if post:
-                    analysis = AnalysisResult(
-                        post_id=post.id,
-                        analysis_type="sentiment_analysis",
-                        status="completed",
-                        score=result.get("score", 0),
-                        category=result.get("sentiment"),
-                        confidence=result.get("confidence", 0),
-                        results=result,
-                        completed_at=datetime.utcnow()
-                    )
-                    session.add(analysis)
-            
-            progress.update(task, advance=1)
+        results = await _analyze_and_store(
+            sentiment_agent, tweets_data, post_id_map,
+            on_progress=lambda count: progress.update(task, advance=count)
+        )
     
     # Show summary
     summary = await sentiment_agent.get_sentiment_summary(results)
@@ -281,24 +466,29 @@ async def _analyze_tweets(tweets_data):
 
 def _display_sentiment_summary(summary):
     """Display sentiment analysis summary."""
+    from rich.panel import Panel
+    
     if "error" in summary:
         rprint(f"[red]✗[/red] {summary['error']}")
         return
     
+    counts = summary['sentiment_distribution']['counts']
+    percentages = summary['sentiment_distribution']['percentages']
+    
     panel_content = f"""
 [bold]Total Posts Analyzed:[/bold] {summary['total_posts']}
 [bold]Successful Analyses:[/bold] {summary['successful_analyses']}
 [bold]Average Confidence:[/bold] {summary['average_confidence']:.2f}
 
 [bold]Sentiment Distribution:[/bold]
-• Positive: {summary['sentiment_distribution']['counts']['positive']} ({summary['sentiment_distribution']['percentages']['positive']:.1f}%)
-• Negative: {summary['sentiment_distribution']['counts']['negative']} ({summary['sentiment_distribution']['percentages']['negative']:.1f}%)
-• Neutral: {summary['sentiment_distribution']['counts']['neutral']} ({summary['sentiment_distribution']['percentages']['neutral']:.1f}%)
+• Positive: {counts.get('positive', 0)} ({percentages.get('positive', 0):.1f}%)
+• Negative: {counts.get('negative', 0)} ({percentages.get('negative', 0):.1f}%)
+• Neutral: {counts.get('neutral', 0)} ({percentages.get('neutral', 0):.1f}%)
 
 [bold]Overall Sentiment:[/bold] {summary['overall_sentiment']}
     """
     
-    console.print(Panel(panel_content, title="Sentiment Analysis Summary", border_style="green"))
+    get_console().print(Panel(panel_content, title="Sentiment Analysis Summary", border_style="green"))
 
 
 @cli.group()
@@ -312,6 +502,9 @@ def analyze():
 @click.option('--days', '-d', default=7, help='Analyze posts from last N days')
 def analyze_sentiment(platform, days):
     """Run sentiment analysis on stored posts."""
+    from src.utils.database import db_manager
+    from src.models import SocialMediaPost
+    
     async def _analyze():
         # Get posts from database
         since_date = datetime.utcnow() - timedelta(days=days)
@@ -341,7 +534,14 @@ def analyze_sentiment(platform, days):
         
         await _analyze_tweets(tweets_data)
     
-    asyncio.run(_analyze())
+    run_async(_analyze())
+
+
+def _truncate(text, width: int = 50) -> str:
+    """Shorten text to ``width`` characters, marking the cut with an ellipsis."""
+    if not text:
+        return ""
+    return text if len(text) <= width else text[:width - 3] + "..."
 
 
 @cli.command()
@@ -349,13 +549,27 @@ def analyze_sentiment(platform, days):
 @click.option('--limit', '-l', default=10, help='Number of posts to show')
 def recent(platform, limit):
     """Show recent posts."""
+    from rich.table import Table
+    from sqlalchemy import select
+    from src.utils.database import db_manager
+    from src.models import SocialMediaPost
+    
+    # Only fetch the displayed columns, not the JSON and raw_data payloads
+    query = select(
+        SocialMediaPost.platform,
+        SocialMediaPost.author_username,
+        SocialMediaPost.content,
+        SocialMediaPost.created_at,
+        SocialMediaPost.likes_count,
+        SocialMediaPost.comments_count,
+        SocialMediaPost.shares_count
+    ).order_by(SocialMediaPost.created_at.desc())
+    
+    if platform:
+        query = query.where(SocialMediaPost.platform == platform)
+    
     with db_manager.session_scope() as session:
-        query = session.query(SocialMediaPost).order_by(SocialMediaPost.created_at.desc())
-        
-        if platform:
-            query = query.filter(SocialMediaPost.platform == platform)
-        
-        posts = query.limit(limit).all()
+        posts = session.execute(query.limit(limit)).all()
     
     if not posts:
         rprint("[yellow]No posts found[/yellow]")
@@ -368,19 +582,16 @@ def recent(platform, limit):
     table.add_column("Created", style="yellow")
     table.add_column("Engagement", style="blue")
     
-    for post in posts:
-        engagement = f"👍{post.likes_count} 💬{post.comments_count} 🔄{post.shares_count}"
-        content = (post.content[:47] + "...") if post.content and len(post.content) > 50 else (post.content or "")
-        
+    for post_platform, author, content, created_at, likes, comments, shares in posts:
         table.add_row(
-            post.platform.upper(),
-            post.author_username or "Unknown",
-            content,
-            post.created_at.strftime("%m/%d %H:%M"),
-            engagement
+            post_platform.upper(),
+            author or "Unknown",
+            _truncate(content),
+            created_at.strftime("%m/%d %H:%M"),
+            f"👍{likes} 💬{comments} 🔄{shares}"
         )
     
-    console.print(table)
+    get_console().print(table)
 
 
 if __name__ == "__main__":
@@ -5,13 +5,40 @@ Data models for the Social Agent system.
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any, List
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, JSON, Boolean, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from pydantic import BaseModel, Field
+from sqlalchemy.sql.expression import FunctionElement
+from pydantic import BaseModel, ConfigDict, Field
 
 Base = declarative_base()
 
+# Binary JSONB on PostgreSQL (parsed once on write), plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+# Row timestamps come from the database clock, in UTC like the app's own timestamps.
+# The SQL default is also rendered inline into INSERTs (no per-row Python call or
+# bound parameter), which covers tables created before server_default was declared.
+class utcnow(FunctionElement):
+    """The database's current time in UTC, comparable with the naive datetime.utcnow() values the app writes."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    # now() follows the session TimeZone; convert before it lands in a naive column
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
 
 class PlatformType(str, Enum):
     """Supported social media platforms."""
@@ -57,11 +84,11 @@ class SocialMediaAccount(Base):
     display_name = Column(String(255))
     account_id = Column(String(255))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     # Configuration for this account
-    config = Column(JSON)
+    config = Column(JSONType)
     
     # Relationships
     posts = relationship("SocialMediaPost", back_populates="account")
@@ -70,10 +97,15 @@ class SocialMediaAccount(Base):
 class SocialMediaPost(Base):
     """Social media post data."""
     __tablename__ = "social_media_posts"
+    __table_args__ = (
+        UniqueConstraint("platform", "post_id", name="uq_social_media_posts_platform_post_id"),
+        # Serves the newest-first listing per platform (scanned backwards for DESC)
+        Index("ix_social_media_posts_platform_created_at", "platform", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     platform = Column(String(50), nullable=False)
-    post_id = Column(String(255), nullable=False, index=True)
+    post_id = Column(String(255), nullable=False)  # Looked up through the (platform, post_id) constraint
     post_type = Column(String(50), default=PostType.POST)
     
     # Post content
@@ -83,8 +115,8 @@ class SocialMediaPost(Base):
     
     # Metadata
     url = Column(String(500))
-    created_at = Column(DateTime, nullable=False)
-    scraped_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, index=True)
+    scraped_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     
     # Engagement metrics
     likes_count = Column(Integer, default=0)
@@ -93,10 +125,10 @@ class SocialMediaPost(Base):
     views_count = Column(Integer, default=0)
     
     # Additional data
-    hashtags = Column(JSON)  # List of hashtags
-    mentions = Column(JSON)  # List of mentions
-    media_urls = Column(JSON)  # List of media URLs
-    raw_data = Column(JSON)  # Raw platform data
+    hashtags = Column(JSONType)  # List of hashtags
+    mentions = Column(JSONType)  # List of mentions
+    media_urls = Column(JSONType)  # List of media URLs
+    raw_data = Column(JSONType)  # Raw platform data
     
     # Foreign keys
     account_id = Column(Integer, ForeignKey("social_media_accounts.id"))
@@ -120,15 +152,15 @@ class AnalysisResult(Base):
     confidence = Column(Float)  # Confidence level
     
     # Detailed results
-    results = Column(JSON)  # Detailed analysis results
-    analysis_metadata = Column(JSON)  # Analysis metadata
+    results = Column(JSONType)  # Detailed analysis results
+    analysis_metadata = Column(JSONType)  # Analysis metadata
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     completed_at = Column(DateTime)
     
     # Foreign keys
-    post_id = Column(Integer, ForeignKey("social_media_posts.id"))
+    post_id = Column(Integer, ForeignKey("social_media_posts.id"), index=True)
     
     # Relationships
     post = relationship("SocialMediaPost", back_populates="analyses")
@@ -145,11 +177,11 @@ class WhatsAppGroup(Base):
     
     # Configuration
     is_monitored = Column(Boolean, default=True)
-    categories = Column(JSON)  # Custom categories for this group
+    categories = Column(JSONType)  # Custom categories for this group
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     messages = relationship("WhatsAppMessage", back_populates="group")
@@ -158,6 +190,9 @@ class WhatsAppGroup(Base):
 class WhatsAppMessage(Base):
     """WhatsApp messages."""
     __tablename__ = "whatsapp_messages"
+    __table_args__ = (
+        Index("ix_whatsapp_messages_group_id_timestamp", "group_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     message_id = Column(String(255), unique=True)
@@ -193,14 +228,14 @@ class AgentTask(Base):
     status = Column(String(50), default=AnalysisStatus.PENDING)
     
     # Task configuration
-    config = Column(JSON)
+    config = Column(JSONType)
     
     # Results
-    result = Column(JSON)
+    result = Column(JSONType)
     error_message = Column(Text)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
 
@@ -223,8 +258,7 @@ class SocialMediaAccountResponse(BaseModel):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SocialMediaPostCreate(BaseModel):
@@ -257,8 +291,7 @@ class SocialMediaPostResponse(BaseModel):
     comments_count: int
     shares_count: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AnalysisResultCreate(BaseModel):
@@ -280,8 +313,7 @@ class AnalysisResultResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WhatsAppGroupCreate(BaseModel):
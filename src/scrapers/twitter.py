@@ -3,25 +3,230 @@ Twitter scraper for collecting tweets and user data.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import tweepy
+import re
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import cycle, islice
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import orjson
 
 from src.utils.config import get_platform_config
 from src.utils.logging import get_logger, log_scraping_activity
-from src.utils.helpers import extract_hashtags, extract_mentions, extract_urls, normalize_datetime
+from src.utils.helpers import normalize_datetime
 from src.models import SocialMediaPost, PostType, PlatformType
 
+# Entity patterns for v1.1 tweet text, compiled once
+_HASHTAG_RE = re.compile(r'#\w+')
+_MENTION_RE = re.compile(r'@\w+')
+_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# Per-request page size bounds of the endpoints used (min, max)
+USER_TWEETS_PAGE_SIZE = (5, 100)
+SEARCH_TWEETS_PAGE_SIZE = (10, 100)
+V1_USER_TIMELINE_PAGE_SIZE = (1, 200)
+V1_SEARCH_PAGE_SIZE = (1, 100)
+
+# Blocking Tweepy calls allowed in flight per API client (each runs in a worker thread)
+MAX_CONCURRENT_REQUESTS = 4
+# Longest OR-ed hashtag query; leaves room under the 512-char search limit for filter operators
+MAX_HASHTAG_QUERY_LENGTH = 450
+
+# Seconds a looked-up user profile is reused before asking the API again
+USER_CACHE_TTL = 600
+# Usernames per users lookup request (v2 get_users and v1.1 lookup_users maximum)
+USERS_PER_LOOKUP = 100
+
+# Conversations whose replies are kept, and seconds before they are topped up from the API
+REPLIES_CACHE_SIZE = 1024
+REPLIES_CACHE_TTL = 300
+# Author profile fields requested alongside tweets (via the author_id expansion)
+USER_FIELDS = ['username', 'name', 'description', 'verified', 'public_metrics']
+
+
+def _cutoff(days_back: int) -> Tuple[float, str]:
+    """Scrape cutoff as a UTC epoch (for per-tweet checks) and an RFC 3339 start_time."""
+    since = datetime.now(timezone.utc) - timedelta(days=days_back)
+    return since.timestamp(), since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _utc_naive(dt: datetime) -> datetime:
+    """Tweepy hands back parsed UTC datetimes; drop the tzinfo for the naive-UTC columns."""
+    if dt.tzinfo is timezone.utc:
+        return dt.replace(tzinfo=None)
+    return normalize_datetime(dt)
+
+
+def _build_query(
+    query: str, exclude_retweets: bool = False, lang: Optional[str] = None,
+    has_media: bool = False, v2: bool = True
+) -> str:
+    """Append server-side filter operators (v2 or v1.1 syntax) to a search query."""
+    # Operators bind tighter than OR, so group an OR query before narrowing it
+    parts = [f"({query})" if " OR " in query else query]
+    if exclude_retweets:
+        parts.append("-is:retweet" if v2 else "-filter:retweets")
+    if lang:
+        parts.append(f"lang:{lang}")
+    if has_media:
+        parts.append("has:media" if v2 else "filter:media")
+    return " ".join(parts)
+
+
+def _hashtag_queries(hashtags: List[str], max_length: int = MAX_HASHTAG_QUERY_LENGTH) -> List[str]:
+    """OR hashtags together into as few queries as fit within ``max_length`` characters."""
+    queries = []
+    current = ""
+    for tag in dict.fromkeys(tag.lstrip("#") for tag in hashtags):
+        term = f"#{tag}"
+        if current and len(current) + len(" OR ") + len(term) > max_length:
+            queries.append(current)
+            current = term
+        else:
+            current = f"{current} OR {term}" if current else term
+    if current:
+        queries.append(current)
+    return queries
+
+
+def _page_size(limit: int, bounds: tuple) -> int:
+    """Fetch `limit` items in as few pages as possible, within the endpoint's bounds."""
+    minimum, maximum = bounds
+    return max(minimum, min(limit, maximum))
+
+
+@dataclass(slots=True)
+class TweetRecord:
+    """A processed tweet, laid out like a SocialMediaPost row.
+    
+    Slotted instead of a dict to keep large scrapes small in memory. Item access
+    (``record["post_id"]``, ``record.get(...)``) works like the dicts it replaced.
+    """
+    platform: PlatformType
+    post_id: str
+    post_type: PostType
+    content: Optional[str]
+    author_username: Optional[str]
+    author_name: Optional[str]
+    url: str
+    created_at: datetime
+    likes_count: int
+    comments_count: int
+    shares_count: int
+    views_count: int
+    hashtags: List[str]
+    mentions: List[str]
+    media_urls: List[str]
+    raw_data: Optional[Dict[str, Any]]
+    
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Column values for inserting the tweet as a SocialMediaPost."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@lru_cache(maxsize=None)
+def _orjson_client_class():
+    """tweepy.Client subclass that decodes response bodies with orjson instead of the stdlib.
+    
+    Built on first use so tweepy is only imported once a scraper is configured.
+    """
+    import tweepy
+    
+    class OrjsonClient(tweepy.Client):
+        def request(self, *args, **kwargs):
+            response = super().request(*args, **kwargs)
+            response.json = lambda **_: orjson.loads(response.content)
+            return response
+    
+    return OrjsonClient
+
+
+def _user_info_v2(user) -> Dict[str, Any]:
+    """Flatten an API v2 user object into the dict returned by get_user_info."""
+    metrics = user.public_metrics or {}
+    return {
+        "user_id": str(user.id),
+        "username": user.username,
+        "name": user.name,
+        "description": getattr(user, 'description', ''),
+        "followers_count": metrics.get('followers_count', 0),
+        "following_count": metrics.get('following_count', 0),
+        "tweet_count": metrics.get('tweet_count', 0),
+        "verified": getattr(user, 'verified', False),
+    }
+
+
+def _user_info_v1(user) -> Dict[str, Any]:
+    """Flatten an API v1.1 user object into the dict returned by get_user_info."""
+    return {
+        "user_id": str(user.id),
+        "username": user.screen_name,
+        "name": user.name,
+        "description": user.description,
+        "followers_count": user.followers_count,
+        "following_count": user.friends_count,
+        "tweet_count": user.statuses_count,
+        "verified": user.verified,
+    }
+
+
+def _extract_entities(text: str) -> Tuple[List[str], List[str], List[str]]:
+    """Extract hashtags, mentions and URLs from tweet text.
+    
+    '#' and '@' inside a URL (fragments, medium.com/@user) are not entities.
+    """
+    if not text:
+        return [], [], []
+    
+    url_matches = list(_URL_RE.finditer(text))
+    url_spans = [match.span() for match in url_matches]
+    
+    def _outside_urls(match) -> bool:
+        return not any(start <= match.start() < end for start, end in url_spans)
+    
+    hashtags = list(dict.fromkeys(match.group().lower() for match in _HASHTAG_RE.finditer(text) if _outside_urls(match)))
+    mentions = list(dict.fromkeys(match.group().lower() for match in _MENTION_RE.finditer(text) if _outside_urls(match)))
+    urls = [match.group() for match in url_matches]
+    return hashtags, mentions, urls
+
 
 class TwitterScraper:
     """Scraper for Twitter data using Tweepy."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        include_raw: bool = True,
+        include_context_annotations: bool = False,
+        include_entities: bool = True
+    ):
         self.platform_config = get_platform_config()
+        self.include_raw = include_raw  # False skips building raw_data for callers that never store it
+        self.include_context_annotations = include_context_annotations
+        
+        # context_annotations is one of the largest tweet fields; only request it when asked for
+        self._tweet_fields = ['created_at', 'public_metrics', 'author_id', 'conversation_id']
+        if include_entities:
+            self._tweet_fields.append('entities')
+        if include_context_annotations:
+            self._tweet_fields.append('context_annotations')
         self.logger = get_logger("scraper.twitter")
         self.api = None
         self.client = None
+        self.clients = []
+        self._rr = None
+        self._user_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._replies_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[TweetRecord]]]" = OrderedDict()
         self._initialize_api()
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS * max(1, len(self.clients)))
     
     def _initialize_api(self):
         """Initialize Twitter API clients."""
@@ -31,6 +236,12 @@ class TwitterScraper:
             self.logger.warning("Twitter API credentials not configured")
             return
         
+        try:
+            import tweepy
+        except ImportError:
+            self.logger.error("Twitter API credentials are set but tweepy is not installed")
+            return
+        
         try:
             # Initialize API v1.1 (for some legacy endpoints)
             auth = tweepy.OAuthHandler(
@@ -46,16 +257,23 @@ class TwitterScraper:
             
             self.api = tweepy.API(auth, wait_on_rate_limit=True)
             
-            # Initialize API v2 client
-            if config.get("bearer_token"):
-                self.client = tweepy.Client(
-                    bearer_token=config["bearer_token"],
+            # Initialize API v2 clients, one per bearer token
+            bearer_tokens = config.get("bearer_tokens") or []
+            if bearer_tokens:
+                client_class = _orjson_client_class()
+                self.client = client_class(
+                    bearer_token=bearer_tokens[0],
                     consumer_key=config["api_key"],
                     consumer_secret=config["api_secret"],
                     access_token=config.get("access_token"),
                     access_token_secret=config.get("access_token_secret"),
                     wait_on_rate_limit=True
                 )
+                self.clients = [self.client] + [
+                    client_class(bearer_token=token, wait_on_rate_limit=True)
+                    for token in bearer_tokens[1:]
+                ]
+                self._rr = cycle(self.clients)
             
             self.logger.info("Twitter API initialized successfully")
             
@@ -63,217 +281,398 @@ class TwitterScraper:
             self.logger.error(f"Failed to initialize Twitter API: {e}")
             self.api = None
             self.client = None
+            self.clients = []
+            self._rr = None
+    
+    def _pick_client(self):
+        """Return the next v2 client from the bearer-token pool (round robin)."""
+        return next(self._rr)
+    
+    def _cache_user(self, user_info: Dict[str, Any]):
+        """Remember a user profile under both its id and its lower-cased username."""
+        entry = (time.monotonic(), user_info)
+        self._user_cache[user_info["user_id"]] = entry
+        self._user_cache[user_info["username"].lower()] = entry
+    
+    def _cached_user(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached user profile by id or lower-cased username, if still fresh."""
+        entry = self._user_cache.get(key)
+        if entry and time.monotonic() - entry[0] < USER_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    async def _fetch_page(self, method, params: Dict[str, Any]):
+        """Request one v2 page in a worker thread, within the request limit."""
+        async with self._sem:
+            return await asyncio.to_thread(method, **params)
+    
+    async def _pages_v2(self, method, limit: int, token_param: str, **params) -> AsyncIterator[List[Any]]:
+        """Page through a v2 endpoint, yielding up to ``limit`` tweets page by page.
+        
+        The next page is requested before the current one is handed to the caller, so
+        processing a page overlaps with fetching the next. Expanded authors are cached.
+        """
+        remaining = limit
+        next_page = asyncio.create_task(self._fetch_page(method, params))
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+                
+                tweets = (response.data or [])[:remaining]
+                remaining -= len(tweets)
+                token = (response.meta or {}).get('next_token')
+                if token and remaining > 0:
+                    next_page = asyncio.create_task(self._fetch_page(method, {**params, token_param: token}))
+                
+                for user in (response.includes or {}).get('users', []):
+                    self._cache_user(_user_info_v2(user))
+                if tweets:
+                    yield tweets
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+    
+    async def _process_pages_v2(self, pages: AsyncIterator[List[Any]], since_ts: float) -> AsyncIterator[List[TweetRecord]]:
+        """Turn v2 pages into batches of processed tweets, stopping at the scrape cutoff."""
+        async with aclosing(pages):
+            async for tweets in pages:
+                batch = []
+                past_cutoff = False
+                for tweet in tweets:
+                    # start_time filters server-side; stop paging if anything older slips through
+                    if tweet.created_at and tweet.created_at.timestamp() < since_ts:
+                        past_cutoff = True
+                        break
+                    tweet_data = self._process_tweet_v2(tweet)
+                    if tweet_data:
+                        batch.append(tweet_data)
+                
+                if batch:
+                    yield batch
+                if past_cutoff:
+                    return
     
     def is_configured(self) -> bool:
         """Check if Twitter scraper is properly configured."""
         return self.client is not None or self.api is not None
     
-    async def scrape_user_tweets(self, username: str, max_tweets: int = 100, days_back: int = 7) -> List[Dict[str, Any]]:
-        """Scrape tweets from a specific user."""
+    async def scrape_user_tweets(
+        self, username: str, max_tweets: int = 100, days_back: int = 7, exclude: Optional[List[str]] = None
+    ) -> List[TweetRecord]:
+        """Scrape tweets from a specific user.
+        
+        ``exclude`` may contain "retweets" and/or "replies" to have the API leave them out.
+        """
+        tweets_data = []
+        async for batch in self.stream_user_tweets(username, max_tweets, days_back, exclude=exclude):
+            tweets_data.extend(batch)
+        return tweets_data
+    
+    async def search_tweets(
+        self, query: str, max_tweets: int = 100, days_back: int = 7,
+        exclude_retweets: bool = False, lang: Optional[str] = None, has_media: bool = False
+    ) -> List[TweetRecord]:
+        """Search for tweets based on a query; the filters are applied by the API."""
+        tweets_data = []
+        async for batch in self.stream_search_tweets(
+            query, max_tweets, days_back,
+            exclude_retweets=exclude_retweets, lang=lang, has_media=has_media
+        ):
+            tweets_data.extend(batch)
+        return tweets_data
+    
+    async def stream_user_tweets(
+        self, username: str, max_tweets: int = 100, days_back: int = 7, batch_size: int = 100,
+        exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[List[TweetRecord]]:
+        """Yield a user's tweets in batches as the API pages arrive."""
         if not self.is_configured():
             raise ValueError("Twitter API not configured")
         
         try:
-            tweets_data = []
-            since_date = datetime.now() - timedelta(days=days_back)
-            
-            # Use API v2 if available, otherwise fall back to v1.1
+            count = 0
             if self.client:
-                tweets = tweepy.Paginator(
-                    self.client.get_users_tweets,
-                    username=username,
-                    max_results=min(max_tweets, 100),
-                    tweet_fields=[
-                        'created_at', 'public_metrics', 'context_annotations',
-                        'entities', 'author_id', 'conversation_id'
-                    ],
-                    start_time=since_date.isoformat()
-                ).flatten(limit=max_tweets)
-                
-                for tweet in tweets:
-                    tweet_data = self._process_tweet_v2(tweet)
-                    if tweet_data:
-                        tweets_data.append(tweet_data)
+                batches = self._stream_user_tweets_v2(username, max_tweets, days_back, batch_size, exclude)
+            else:
+                batches = self._stream(self._iter_user_tweets(username, max_tweets, days_back, exclude), batch_size)
             
-            elif self.api:
-                tweets = tweepy.Cursor(
-                    self.api.user_timeline,
-                    screen_name=username,
-                    count=min(max_tweets, 200),
-                    include_rts=True,
-                    exclude_replies=False,
-                    tweet_mode='extended'
-                ).items(max_tweets)
-                
-                for tweet in tweets:
-                    if tweet.created_at >= since_date:
-                        tweet_data = self._process_tweet_v1(tweet)
-                        if tweet_data:
-                            tweets_data.append(tweet_data)
+            async with aclosing(batches):
+                async for batch in batches:
+                    count += len(batch)
+                    yield batch
             
-            log_scraping_activity("twitter", f"scraped user tweets for @{username}", len(tweets_data))
-            return tweets_data
+            log_scraping_activity("twitter", f"scraped user tweets for @{username}", count)
             
         except Exception as e:
             self.logger.error(f"Failed to scrape tweets for user {username}: {e}")
             raise
     
-    async def search_tweets(self, query: str, max_tweets: int = 100, days_back: int = 7) -> List[Dict[str, Any]]:
-        """Search for tweets based on a query."""
+    async def stream_search_tweets(
+        self, query: str, max_tweets: int = 100, days_back: int = 7, batch_size: int = 100,
+        exclude_retweets: bool = False, lang: Optional[str] = None, has_media: bool = False
+    ) -> AsyncIterator[List[TweetRecord]]:
+        """Yield tweets matching a query in batches as the API pages arrive."""
         if not self.is_configured():
             raise ValueError("Twitter API not configured")
         
         try:
-            tweets_data = []
-            since_date = datetime.now() - timedelta(days=days_back)
-            
+            count = 0
             if self.client:
-                tweets = tweepy.Paginator(
-                    self.client.search_recent_tweets,
-                    query=query,
-                    max_results=min(max_tweets, 100),
-                    tweet_fields=[
-                        'created_at', 'public_metrics', 'context_annotations',
-                        'entities', 'author_id', 'conversation_id'
-                    ],
-                    start_time=since_date.isoformat()
-                ).flatten(limit=max_tweets)
-                
-                for tweet in tweets:
-                    tweet_data = self._process_tweet_v2(tweet)
-                    if tweet_data:
-                        tweets_data.append(tweet_data)
+                batches = self._stream_search_tweets_v2(
+                    _build_query(query, exclude_retweets, lang, has_media), max_tweets, days_back, batch_size
+                )
+            else:
+                batches = self._stream(
+                    self._iter_search_tweets(query, max_tweets, days_back, exclude_retweets, lang, has_media), batch_size
+                )
             
-            elif self.api:
-                tweets = tweepy.Cursor(
-                    self.api.search_tweets,
-                    q=query,
-                    count=min(max_tweets, 100),
-                    result_type='recent',
-                    tweet_mode='extended'
-                ).items(max_tweets)
-                
-                for tweet in tweets:
-                    if tweet.created_at >= since_date:
-                        tweet_data = self._process_tweet_v1(tweet)
-                        if tweet_data:
-                            tweets_data.append(tweet_data)
+            async with aclosing(batches):
+                async for batch in batches:
+                    count += len(batch)
+                    yield batch
             
-            log_scraping_activity("twitter", f"searched tweets for query: {query}", len(tweets_data))
-            return tweets_data
+            log_scraping_activity("twitter", f"searched tweets for query: {query}", count)
             
         except Exception as e:
             self.logger.error(f"Failed to search tweets for query {query}: {e}")
             raise
     
-    async def scrape_tweet_replies(self, tweet_id: str, max_replies: int = 50) -> List[Dict[str, Any]]:
-        """Scrape replies to a specific tweet."""
+    async def _stream(self, tweets: Iterator[TweetRecord], batch_size: int) -> AsyncIterator[List[TweetRecord]]:
+        """Drain a blocking tweet iterator in a worker thread, one batch at a time."""
+        while True:
+            async with self._sem:
+                batch = await asyncio.to_thread(list, islice(tweets, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    async def _stream_user_tweets_v2(
+        self, username: str, max_tweets: int, days_back: int, batch_size: int, exclude: Optional[List[str]] = None
+    ) -> AsyncIterator[List[TweetRecord]]:
+        """Page through a user's timeline with API v2."""
+        # The timeline endpoint takes the user id, not the handle
+        user = await self.get_user_info(username)
+        if not user:
+            raise ValueError(f"Twitter user not found: {username}")
+        
+        since_ts, since_iso = _cutoff(days_back)
+        pages = self._pages_v2(
+            self._pick_client().get_users_tweets, max_tweets, 'pagination_token',
+            id=user["user_id"],
+            max_results=_page_size(min(max_tweets, batch_size), USER_TWEETS_PAGE_SIZE),
+            tweet_fields=self._tweet_fields,
+            expansions=['author_id'],
+            user_fields=USER_FIELDS,
+            start_time=since_iso,
+            exclude=exclude or None
+        )
+        async with aclosing(self._process_pages_v2(pages, since_ts)) as batches:
+            async for batch in batches:
+                yield batch
+    
+    async def _stream_search_tweets_v2(
+        self, query: str, max_tweets: int, days_back: int, batch_size: int
+    ) -> AsyncIterator[List[TweetRecord]]:
+        """Page through recent search results with API v2."""
+        since_ts, since_iso = _cutoff(days_back)
+        pages = self._pages_v2(
+            self._pick_client().search_recent_tweets, max_tweets, 'next_token',
+            query=query,
+            max_results=_page_size(min(max_tweets, batch_size), SEARCH_TWEETS_PAGE_SIZE),
+            tweet_fields=self._tweet_fields,
+            expansions=['author_id'],
+            user_fields=USER_FIELDS,
+            start_time=since_iso
+        )
+        async with aclosing(self._process_pages_v2(pages, since_ts)) as batches:
+            async for batch in batches:
+                yield batch
+    
+    def _iter_user_tweets(
+        self, username: str, max_tweets: int, days_back: int, exclude: Optional[List[str]] = None
+    ) -> Iterator[TweetRecord]:
+        """Lazily fetch and process a user's tweets with API v1.1; pages are requested on demand."""
+        import tweepy
+        
+        since_ts, _ = _cutoff(days_back)
+        exclude = exclude or []
+        tweets = tweepy.Cursor(
+            self.api.user_timeline,
+            screen_name=username,
+            count=_page_size(max_tweets, V1_USER_TIMELINE_PAGE_SIZE),
+            include_rts='retweets' not in exclude,
+            exclude_replies='replies' in exclude,
+            tweet_mode='extended'
+        ).items(max_tweets)
+        
+        # Results come newest first: the first tweet past the cutoff ends the
+        # walk instead of paging through older tweets up to max_tweets
+        for tweet in tweets:
+            if tweet.created_at.timestamp() < since_ts:
+                break
+            tweet_data = self._process_tweet_v1(tweet)
+            if tweet_data:
+                yield tweet_data
+    
+    def _iter_search_tweets(
+        self, query: str, max_tweets: int, days_back: int,
+        exclude_retweets: bool = False, lang: Optional[str] = None, has_media: bool = False
+    ) -> Iterator[TweetRecord]:
+        """Lazily fetch and process tweets matching a query with API v1.1; pages are requested on demand."""
+        import tweepy
+        
+        since_ts, _ = _cutoff(days_back)
+        tweets = tweepy.Cursor(
+            self.api.search_tweets,
+            q=_build_query(query, exclude_retweets, lang, has_media, v2=False),
+            count=_page_size(max_tweets, V1_SEARCH_PAGE_SIZE),
+            result_type='recent',
+            tweet_mode='extended'
+        ).items(max_tweets)
+        
+        # Results come newest first: the first tweet past the cutoff ends the
+        # walk instead of paging through older tweets up to max_tweets
+        for tweet in tweets:
+            if tweet.created_at.timestamp() < since_ts:
+                break
+            tweet_data = self._process_tweet_v1(tweet)
+            if tweet_data:
+                yield tweet_data
+    
+    async def scrape_tweet_replies(self, tweet_id: str, max_replies: int = 50) -> List[TweetRecord]:
+        """Scrape replies to a specific tweet.
+        
+        Replies are cached per conversation; within REPLIES_CACHE_TTL the cached list is
+        returned as is, after that only replies newer than the cached ones are fetched.
+        """
         if not self.client:
             self.logger.warning("Tweet replies require API v2")
             return []
         
+        key = (tweet_id, max_replies)
+        cached_replies = []
+        cached = self._replies_cache.get(key)
+        if cached:
+            self._replies_cache.move_to_end(key)
+            fetched_at, cached_replies = cached
+            if time.monotonic() - fetched_at < REPLIES_CACHE_TTL:
+                return list(cached_replies)
+        
         try:
             # Search for tweets that are replies to the original tweet
             query = f"conversation_id:{tweet_id}"
             
-            replies = tweepy.Paginator(
-                self.client.search_recent_tweets,
+            pages = self._pages_v2(
+                self._pick_client().search_recent_tweets, max_replies, 'next_token',
                 query=query,
-                max_results=min(max_replies, 100),
-                tweet_fields=[
-                    'created_at', 'public_metrics', 'context_annotations',
-                    'entities', 'author_id', 'conversation_id', 'in_reply_to_user_id'
-                ]
-            ).flatten(limit=max_replies)
+                max_results=_page_size(max_replies, SEARCH_TWEETS_PAGE_SIZE),
+                tweet_fields=self._tweet_fields + ['in_reply_to_user_id'],
+                expansions=['author_id'],
+                user_fields=USER_FIELDS,
+                since_id=max((reply.post_id for reply in cached_replies), key=int, default=None)
+            )
             
             replies_data = []
-            for reply in replies:
-                if reply.id != tweet_id:  # Exclude the original tweet
-                    reply_data = self._process_tweet_v2(reply, post_type=PostType.REPLY)
-                    if reply_data:
-                        replies_data.append(reply_data)
+            append = replies_data.append
+            process = self._process_tweet_v2
+            async with aclosing(pages):
+                async for replies in pages:
+                    for reply in replies:
+                        if reply.data['id'] != tweet_id:  # Exclude the original tweet
+                            reply_data = process(reply, post_type=PostType.REPLY)
+                            if reply_data:
+                                append(reply_data)
             
             log_scraping_activity("twitter", f"scraped replies for tweet {tweet_id}", len(replies_data))
-            return replies_data
+            
+            # Search returns newest first, so new replies go in front of the cached ones
+            replies_data = (replies_data + cached_replies)[:max_replies]
+            self._replies_cache[key] = (time.monotonic(), replies_data)
+            self._replies_cache.move_to_end(key)
+            if len(self._replies_cache) > REPLIES_CACHE_SIZE:
+                self._replies_cache.popitem(last=False)
+            return list(replies_data)
             
         except Exception as e:
             self.logger.error(f"Failed to scrape replies for tweet {tweet_id}: {e}")
             return []
     
-    def _process_tweet_v2(self, tweet, post_type: PostType = PostType.POST) -> Optional[Dict[str, Any]]:
+    def _process_tweet_v2(self, tweet, post_type: PostType = PostType.POST) -> Optional[TweetRecord]:
         """Process a tweet from API v2."""
         try:
-            # Get public metrics
-            metrics = tweet.public_metrics or {}
+            # Read the raw response dict tweepy keeps on the Tweet; ids are already strings
+            data = tweet.data
+            tweet_id = data['id']
+            author_id = data.get('author_id')
+            metrics = data.get('public_metrics') or {}
             
-            # Extract entities
-            entities = tweet.entities or {}
-            hashtags = [tag['tag'] for tag in entities.get('hashtags', [])]
-            mentions = [mention['username'] for mention in entities.get('mentions', [])]
-            urls = [url['expanded_url'] for url in entities.get('urls', []) if url.get('expanded_url')]
+            # Extract entities (deduplicated in order; tags and handles are case-insensitive)
+            entities = data.get('entities') or {}
+            hashtags = list(dict.fromkeys(tag['tag'].lower() for tag in entities.get('hashtags', [])))
+            mentions = list(dict.fromkeys(mention['username'].lower() for mention in entities.get('mentions', [])))
+            urls = list(dict.fromkeys(url['expanded_url'] for url in entities.get('urls', []) if url.get('expanded_url')))
             
-            return {
-                "platform": PlatformType.TWITTER,
-                "post_id": str(tweet.id),
-                "post_type": post_type,
-                "content": tweet.text,
-                "author_username": None,  # Need to fetch user data separately
-                "author_name": None,
-                "url": f"https://twitter.com/user/status/{tweet.id}",
-                "created_at": normalize_datetime(tweet.created_at),
-                "likes_count": metrics.get('like_count', 0),
-                "comments_count": metrics.get('reply_count', 0),
-                "shares_count": metrics.get('retweet_count', 0),
-                "views_count": metrics.get('impression_count', 0),
-                "hashtags": hashtags,
-                "mentions": mentions,
-                "media_urls": urls,
-                "raw_data": {
-                    "tweet_id": str(tweet.id),
-                    "author_id": str(tweet.author_id) if tweet.author_id else None,
-                    "conversation_id": str(tweet.conversation_id) if tweet.conversation_id else None,
+            # Filled from the author_id expansion of the same response
+            author = self._cached_user(author_id) if author_id else None
+            
+            raw_data = None
+            if self.include_raw:
+                raw_data = {
+                    "tweet_id": tweet_id,
+                    "author_id": author_id,
+                    "conversation_id": data.get('conversation_id'),
                     "public_metrics": metrics,
-                    "context_annotations": getattr(tweet, 'context_annotations', []),
                 }
-            }
+                if self.include_context_annotations:
+                    raw_data["context_annotations"] = data.get('context_annotations', [])
+            
+            return TweetRecord(
+                platform=PlatformType.TWITTER,
+                post_id=tweet_id,
+                post_type=post_type,
+                content=data['text'],
+                author_username=author["username"] if author else None,
+                author_name=author["name"] if author else None,
+                url=f"https://twitter.com/user/status/{tweet_id}",
+                created_at=_utc_naive(tweet.created_at),
+                likes_count=metrics.get('like_count', 0),
+                comments_count=metrics.get('reply_count', 0),
+                shares_count=metrics.get('retweet_count', 0),
+                views_count=metrics.get('impression_count', 0),
+                hashtags=hashtags,
+                mentions=mentions,
+                media_urls=urls,
+                raw_data=raw_data,
+            )
             
         except Exception as e:
             self.logger.error(f"Failed to process tweet v2: {e}")
             return None
     
-    def _process_tweet_v1(self, tweet, post_type: PostType = PostType.POST) -> Optional[Dict[str, Any]]:
+    def _process_tweet_v1(self, tweet, post_type: PostType = PostType.POST) -> Optional[TweetRecord]:
         """Process a tweet from API v1.1."""
         try:
             # Get tweet text (full text for extended tweets)
             text = getattr(tweet, 'full_text', tweet.text)
             
-            # Extract hashtags and mentions
-            hashtags = extract_hashtags(text)
-            mentions = extract_mentions(text, "twitter")
-            urls = extract_urls(text)
+            # Use the entities Twitter already parsed; only scan the text when they're missing
+            entities = getattr(tweet, 'entities', None)
+            if entities:
+                hashtags = list(dict.fromkeys("#" + tag['text'].lower() for tag in entities.get('hashtags', [])))
+                mentions = list(dict.fromkeys("@" + mention['screen_name'].lower() for mention in entities.get('user_mentions', [])))
+                urls = [url['expanded_url'] for url in entities.get('urls', []) if url.get('expanded_url')]
+            else:
+                hashtags, mentions, urls = _extract_entities(text)
             
             # Get media URLs if available
             media_urls = []
-            if hasattr(tweet, 'entities') and 'media' in tweet.entities:
-                media_urls = [media['media_url_https'] for media in tweet.entities['media']]
+            if entities and 'media' in entities:
+                media_urls = [media['media_url_https'] for media in entities['media']]
             
-            return {
-                "platform": PlatformType.TWITTER,
-                "post_id": str(tweet.id),
-                "post_type": post_type,
-                "content": text,
-                "author_username": tweet.user.screen_name,
-                "author_name": tweet.user.name,
-                "url": f"https://twitter.com/{tweet.user.screen_name}/status/{tweet.id}",
-                "created_at": normalize_datetime(tweet.created_at),
-                "likes_count": tweet.favorite_count,
-                "comments_count": 0,  # Not available in v1.1
-                "shares_count": tweet.retweet_count,
-                "views_count": 0,  # Not available in v1.1
-                "hashtags": hashtags,
-                "mentions": mentions,
-                "media_urls": media_urls + urls,
-                "raw_data": {
+            raw_data = None
+            if self.include_raw:
+                raw_data = {
                     "tweet_id": str(tweet.id),
                     "user_id": str(tweet.user.id),
                     "is_retweet": hasattr(tweet, 'retweeted_status'),
@@ -282,7 +681,25 @@ class TwitterScraper:
                     "geo": getattr(tweet, 'geo', None),
                     "place": getattr(tweet, 'place', None),
                 }
-            }
+            
+            return TweetRecord(
+                platform=PlatformType.TWITTER,
+                post_id=str(tweet.id),
+                post_type=post_type,
+                content=text,
+                author_username=tweet.user.screen_name,
+                author_name=tweet.user.name,
+                url=f"https://twitter.com/{tweet.user.screen_name}/status/{tweet.id}",
+                created_at=_utc_naive(tweet.created_at),
+                likes_count=tweet.favorite_count,
+                comments_count=0,  # Not available in v1.1
+                shares_count=tweet.retweet_count,
+                views_count=0,  # Not available in v1.1
+                hashtags=hashtags,
+                mentions=mentions,
+                media_urls=list(dict.fromkeys(media_urls + urls)),
+                raw_data=raw_data,
+            )
             
         except Exception as e:
             self.logger.error(f"Failed to process tweet v1: {e}")
@@ -290,50 +707,76 @@ class TwitterScraper:
     
     async def get_user_info(self, username: str) -> Optional[Dict[str, Any]]:
         """Get user information."""
+        users = await self.get_users_info([username])
+        return users.get(username.lower())
+    
+    async def get_users_info(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get user information for many users, keyed by lower-cased username.
+        
+        Cached profiles are reused; the rest are looked up USERS_PER_LOOKUP per request.
+        """
         if not self.is_configured():
-            return None
+            return {}
         
+        users = {}
+        missing = []
+        for username in dict.fromkeys(name.lower() for name in usernames):
+            cached = self._cached_user(username)
+            if cached:
+                users[username] = cached
+            else:
+                missing.append(username)
+        
+        chunks = [missing[i:i + USERS_PER_LOOKUP] for i in range(0, len(missing), USERS_PER_LOOKUP)]
+        for fetched in await asyncio.gather(*[self._fetch_users(chunk) for chunk in chunks]):
+            for user_info in fetched:
+                self._cache_user(user_info)
+                users[user_info["username"].lower()] = user_info
+        
+        return users
+    
+    async def _fetch_users(self, usernames: List[str]) -> List[Dict[str, Any]]:
+        """Look up one chunk of usernames in a single request."""
         try:
-            if self.client:
-                user = self.client.get_user(username=username, user_fields=['public_metrics'])
-                if user.data:
-                    metrics = user.data.public_metrics or {}
-                    return {
-                        "user_id": str(user.data.id),
-                        "username": user.data.username,
-                        "name": user.data.name,
-                        "description": getattr(user.data, 'description', ''),
-                        "followers_count": metrics.get('followers_count', 0),
-                        "following_count": metrics.get('following_count', 0),
-                        "tweet_count": metrics.get('tweet_count', 0),
-                        "verified": getattr(user.data, 'verified', False),
-                    }
-            
-            elif self.api:
-                user = self.api.get_user(screen_name=username)
-                return {
-                    "user_id": str(user.id),
-                    "username": user.screen_name,
-                    "name": user.name,
-                    "description": user.description,
-                    "followers_count": user.followers_count,
-                    "following_count": user.friends_count,
-                    "tweet_count": user.statuses_count,
-                    "verified": user.verified,
-                }
-            
-            return None
+            async with self._sem:
+                if self.client:
+                    response = await asyncio.to_thread(
+                        self._pick_client().get_users, usernames=usernames, user_fields=USER_FIELDS
+                    )
+                    return [_user_info_v2(user) for user in response.data or []]
+                
+                users = await asyncio.to_thread(self.api.lookup_users, screen_name=usernames)
+                return [_user_info_v1(user) for user in users]
             
         except Exception as e:
-            self.logger.error(f"Failed to get user info for {username}: {e}")
-            return None
+            self.logger.error(f"Failed to get user info for {', '.join(usernames)}: {e}")
+            return []
     
-    async def monitor_mentions(self, username: str, max_mentions: int = 50) -> List[Dict[str, Any]]:
+    async def monitor_mentions(
+        self, username: str, max_mentions: int = 50,
+        exclude_retweets: bool = False, lang: Optional[str] = None
+    ) -> List[TweetRecord]:
         """Monitor mentions of a specific username."""
         query = f"@{username} -from:{username}"  # Exclude self-mentions
-        return await self.search_tweets(query, max_mentions)
+        return await self.search_tweets(query, max_mentions, exclude_retweets=exclude_retweets, lang=lang)
     
-    async def monitor_hashtags(self, hashtags: List[str], max_tweets: int = 100) -> List[Dict[str, Any]]:
+    async def monitor_hashtags(
+        self, hashtags: List[str], max_tweets: int = 100, days_back: int = 7,
+        exclude_retweets: bool = False, lang: Optional[str] = None
+    ) -> List[TweetRecord]:
         """Monitor specific hashtags."""
-        query = " OR ".join([f"#{tag}" for tag in hashtags])
-        return await self.search_tweets(query, max_tweets)
+        filters = {"exclude_retweets": exclude_retweets, "lang": lang}
+        queries = _hashtag_queries(hashtags)
+        if len(queries) == 1:
+            return await self.search_tweets(queries[0], max_tweets, days_back, **filters)
+        
+        # Too many tags for one query: search the groups in parallel and merge
+        results = await asyncio.gather(*[
+            self.search_tweets(query, max_tweets, days_back, **filters) for query in queries
+        ])
+        
+        tweets_data = {}
+        for tweets in results:
+            for tweet in tweets:
+                tweets_data.setdefault(tweet["post_id"], tweet)
+        return list(tweets_data.values())[:max_tweets]
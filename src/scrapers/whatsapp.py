@@ -3,10 +3,19 @@ WhatsApp scraper using Selenium WebDriver for web-based WhatsApp monitoring.
 """
 
 import asyncio
+import atexit
+import inspect
 import time
 import json
 import os
-from typing import Dict, Any, List, Optional, Callable
+import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import cycle
+from operator import itemgetter
+from urllib.request import urlopen
+from typing import Dict, Any, List, Optional, Callable, Tuple, get_origin
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,7 +23,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException, JavascriptException
+import websocket
 from webdriver_manager.chrome import ChromeDriverManager
 
 from src.utils.config import get_platform_config
@@ -23,11 +33,245 @@ from src.utils.helpers import clean_text, normalize_datetime
 from src.utils.vector_db import get_vector_db
 from src.models import PlatformType
 
+# Element locators, built once (the in-page scripts below use the same selectors)
+_SEL_CHAT_LIST = (By.CSS_SELECTOR, "[data-testid='chat-list']")
+_SEL_QR_CODE = (By.CSS_SELECTOR, "[data-ref]")
+_SEL_SEARCH = (By.CSS_SELECTOR, "[data-testid='chat-list-search']")
+_SEL_CELL_FRAME = (By.CSS_SELECTOR, "[data-testid='cell-frame-container']")
+_SEL_CONV_HEADER = (By.CSS_SELECTOR, "[data-testid='conversation-header']")
+_SEL_CONV_PANEL = (By.CSS_SELECTOR, "[data-testid='conversation-panel-messages']")
+_SEL_MSG_INPUT = (By.CSS_SELECTOR, "[data-testid='msg-input']")
+_SEL_SEND_BUTTON = (By.CSS_SELECTOR, "[data-testid='send-button']")
+
+# Sender out of a message's data-pre-plain-text: "[HH:MM, DD/MM/YYYY] Sender Name: "
+_SENDER_RE = re.compile(r"\] (.*?)(?:\] |$)", re.S)
+
+# Chat-list and bubble times: "HH:MM" (today), "DD/MM/YYYY" or "Yesterday"
+_TIMESTAMP_RE = re.compile(r"^(?:(\d{1,2}):(\d{2})|(\d{1,2})/(\d{1,2})/(\d{4})|yesterday)$", re.I)
+
+# Background services (sync, updates, crash reporting, ...) that compete with scraping
+_QUIET_CHROME_FLAGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-component-update",
+    "--disable-breakpad",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--blink-settings=imagesEnabled=false",  # Backs up the images pref below on some Chrome versions
+)
+
+# Resources the scraper never reads, blocked over CDP when block_media is on
+_BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp",
+    "*.mp4", "*.mp3", "*.ogg", "*.opus",
+    "*.woff", "*.woff2", "*.ttf",
+]
+
+# Upper bound on waiting for chat search results to replace the chat list
+SEARCH_RESULTS_TIMEOUT = 2
+
+# Title of the chat currently open, to confirm it is still the one we opened
+_OPEN_CHAT_TITLE_JS = """
+const title = document.querySelector("[data-testid='conversation-header'] span");
+return title ? title.innerText.trim() : null;
+"""
+
+# Message fields the vector DB stores, handed over column-wise
+_VECTOR_DB_FIELDS = ("content", "sender", "group_name", "timestamp", "message_type", "platform")
+
+# History loading: scroll up until the panel stops growing or holds enough messages
+MAX_SCROLL_ROUNDS = 10
+SCROLL_SETTLE_SECONDS = 0.3
+
+_SCROLL_TOP_JS = """
+arguments[0].scrollTop = 0;
+return [arguments[0].scrollHeight, document.querySelectorAll("[data-testid='msg-container']").length];
+"""
+
+# In-page extraction scripts: one WebDriver round trip returns every field we need,
+# instead of several find_element/get_attribute calls per element.
+_EXTRACT_CHATS_JS = """
+const text = (el, sel) => { const found = el.querySelector(sel); return found ? found.innerText : null; };
+return Array.from(document.querySelectorAll("[data-testid='cell-frame-container']"))
+    .slice(0, arguments[0])
+    .map(el => ({
+        name: text(el, "[data-testid='conversation-info-header']"),
+        last_message: text(el, "[data-testid='last-msg-preview']"),
+        time: text(el, "[data-testid='msg-time']"),
+        element: el
+    }));
+"""
+
+_MESSAGE_FIELDS_JS = """
+const text = (el, sel) => { const found = el.querySelector(sel); return found ? found.innerText : null; };
+// Every message script takes "include the HTML excerpt" as its second argument
+const withHtml = arguments[1];
+const messageFields = el => {
+    const meta = el.querySelector("[data-testid='msg-meta']");
+    // outerHTML is read once and serves the type check and the debug excerpt
+    const html = el.outerHTML;
+    const lowered = html.toLowerCase();
+    const kind = lowered.includes("image") ? "media"
+        : lowered.includes("audio") ? "audio"
+        : lowered.includes("document") ? "document" : null;
+    return {
+        text: text(el, "[data-testid='msg-text']"),
+        caption: text(el, "[data-testid='media-caption']"),
+        meta: meta ? meta.getAttribute("data-pre-plain-text") : null,
+        time: text(el, "[data-testid='msg-time']"),
+        outgoing: el.classList.contains("message-out"),
+        kind: kind,
+        html: withHtml ? html.slice(0, 500) : null
+    };
+};
+"""
+
+_EXTRACT_MESSAGES_JS = _MESSAGE_FIELDS_JS + """
+return Array.from(document.querySelectorAll("[data-testid='msg-container']"))
+    .slice(-arguments[0])
+    .map(messageFields);
+"""
+
+# Push model for an open chat: a MutationObserver on the conversation panel buffers
+# message containers as they are added, and each check drains only that buffer.
+_WATCH_MESSAGES_JS = """
+const panel = document.querySelector("[data-testid='conversation-panel-messages']");
+if (window.__newMsgsObserver) window.__newMsgsObserver.disconnect();
+window.__newMsgs = [];
+window.__watchedChat = null;
+if (!panel) return false;
+window.__newMsgsObserver = new MutationObserver(mutations => mutations.forEach(m => m.addedNodes.forEach(node => {
+    if (node.nodeType !== 1) return;
+    if (node.matches("[data-testid='msg-container']")) window.__newMsgs.push(node);
+    else node.querySelectorAll("[data-testid='msg-container']").forEach(el => window.__newMsgs.push(el));
+})));
+window.__newMsgsObserver.observe(panel, {childList: true, subtree: true});
+window.__watchedChat = arguments[0];
+window.__watchedPanel = panel;
+return true;
+"""
+
+# Returns null when the observer is not watching this chat any more
+# (another chat was opened or the page reloaded)
+_DRAIN_MESSAGES_JS = _MESSAGE_FIELDS_JS + """
+if (window.__watchedChat !== arguments[0] || !window.__watchedPanel.isConnected) return null;
+const buffered = window.__newMsgs;
+window.__newMsgs = [];
+return buffered.filter(el => el.isConnected).map(messageFields);
+"""
+
+
+# ChromeDriver binary, resolved once per process and shared by every scraper
+_CHROMEDRIVER_PATH: Optional[str] = None
+_CHROMEDRIVER_LOCK = threading.Lock()
+
+
+def _chromedriver_path() -> str:
+    """Install (or look up) ChromeDriver on first use only."""
+    global _CHROMEDRIVER_PATH
+    with _CHROMEDRIVER_LOCK:  # Pooled scrapers start their drivers concurrently
+        if _CHROMEDRIVER_PATH is None:
+            _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+        return _CHROMEDRIVER_PATH
+
+
+@lru_cache(maxsize=None)
+def _takes_message_batch(callback: Callable) -> bool:
+    """Whether a message callback's first parameter is annotated as a list (of messages)."""
+    try:
+        first = next(iter(inspect.signature(callback).parameters.values()), None)
+    except (TypeError, ValueError):
+        return False
+    if first is None:
+        return False
+    annotation = first.annotation
+    if isinstance(annotation, str):
+        return annotation.startswith(("List", "list"))
+    return annotation is list or get_origin(annotation) is list
+
+
+@lru_cache(maxsize=256)
+def _parse_timestamp(timestamp_text: str, now: datetime) -> datetime:
+    """Parse a WhatsApp time relative to ``now``; unparseable text maps to ``now``."""
+    try:
+        # WhatsApp shows time in various formats like "12:34", "Yesterday", "DD/MM/YYYY"
+        match = _TIMESTAMP_RE.match(timestamp_text)
+        
+        if not match:
+            return now
+        
+        if match.group(1):
+            # Format: "HH:MM" (today)
+            return now.replace(hour=int(match.group(1)), minute=int(match.group(2)))
+        
+        if match.group(3):
+            # Format: "DD/MM/YYYY"
+            return datetime(int(match.group(5)), int(match.group(4)), int(match.group(3)))
+        
+        # "Yesterday"
+        return now - timedelta(days=1)
+        
+    except ValueError:
+        return now
+
+
+class _CdpChannel:
+    """Persistent DevTools websocket to the WhatsApp page, for value-returning scripts.
+    
+    Each execute_script is a fresh HTTP request to ChromeDriver; this sends the
+    script straight to the page as Runtime.evaluate over one open connection.
+    Scripts keep their execute_script shape (``return`` and ``arguments[i]``),
+    but arguments and results must be JSON values, not elements.
+    """
+    
+    def __init__(self, debugger_address: str):
+        with urlopen(f"http://{debugger_address}/json", timeout=5) as response:
+            targets = json.load(response)
+        page = next(t for t in targets if t["type"] == "page" and "web.whatsapp.com" in t["url"])
+        # No Origin header, so Chrome accepts the connection without --remote-allow-origins
+        self._ws = websocket.create_connection(page["webSocketDebuggerUrl"], timeout=30, suppress_origin=True)
+        self._next_id = 0
+    
+    def evaluate(self, script: str, *args: Any) -> Any:
+        """Run a script body in the page and return its value."""
+        self._next_id += 1
+        request_id = self._next_id
+        self._ws.send(json.dumps({
+            "id": request_id,
+            "method": "Runtime.evaluate",
+            "params": {
+                "expression": f"(function(){{{script}}}).apply(null, {json.dumps(args)})",
+                "returnByValue": True,
+                "awaitPromise": True,
+            },
+        }))
+        while True:
+            reply = json.loads(self._ws.recv())
+            if reply.get("id") == request_id:
+                break
+        
+        if "error" in reply:
+            raise WebDriverException(reply["error"].get("message"))
+        result = reply["result"]
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise JavascriptException(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+    
+    def close(self) -> None:
+        """Close the websocket."""
+        self._ws.close()
+
 
 class WhatsAppScraper:
     """WhatsApp scraper using Selenium WebDriver for web.whatsapp.com."""
     
-    def __init__(self):
+    def __init__(self, profile_name: str = "chrome_profile"):
         self.platform_config = get_platform_config()
         self.logger = get_logger("scraper.whatsapp")
         self.vector_db = get_vector_db()
@@ -36,10 +280,17 @@ class WhatsAppScraper:
         self.is_logged_in = False
         self.last_message_time = {}  # Track last message time per chat
         self.message_callback: Optional[Callable] = None
+        self.profile_name = profile_name  # Chrome profiles can't be shared between drivers
+        self._driver_lock = asyncio.Lock()  # One chat at a time per browser tab
+        self._cdp: Optional[_CdpChannel] = None  # Hot-path scripts once logged in
+        self._current_chat: Optional[str] = None  # Chat last opened in this browser
         
         # Configuration
         self.config = self.platform_config.get_whatsapp_config()
         self.session_path = self.config["session_path"]
+        self.chats_to_monitor = tuple(self.config["monitor_groups"] + self.config["monitor_contacts"])
+        self.monitor_interval = self.platform_config.settings.message_processing_interval
+        self.store_raw_html = self.config.get("store_raw_html", False)
         
         # Ensure session directory exists
         os.makedirs(self.session_path, exist_ok=True)
@@ -60,8 +311,12 @@ class WhatsAppScraper:
             chrome_options.add_argument("--disable-web-security")
             chrome_options.add_argument("--allow-running-insecure-content")
             
+            # Keep Chrome's background services quiet during long monitoring sessions
+            for flag in _QUIET_CHROME_FLAGS:
+                chrome_options.add_argument(flag)
+            
             # User data directory for session persistence
-            user_data_dir = os.path.join(self.session_path, "chrome_profile")
+            user_data_dir = os.path.join(self.session_path, self.profile_name)
             chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
             
             # Headless mode (configurable)
@@ -79,11 +334,16 @@ class WhatsAppScraper:
             chrome_options.add_experimental_option("prefs", prefs)
             
             # Install and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
+            service = Service(await asyncio.to_thread(_chromedriver_path))
             
             # Create driver
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.implicitly_wait(10)
+            # No implicit wait: it would stall every lookup of an optional element.
+            # Waits are explicit (WebDriverWait) where the page really has to catch up.
+            self.driver = await asyncio.to_thread(webdriver.Chrome, service=service, options=chrome_options)
+            atexit.register(self._quit_driver)  # Don't leave Chrome running if close() is never awaited
+            
+            if self.config.get("block_media", True):
+                await asyncio.to_thread(self._block_media_requests)
             
             self.logger.info("Chrome WebDriver initialized successfully")
             return True
@@ -92,6 +352,14 @@ class WhatsAppScraper:
             self.logger.error(f"Failed to initialize Chrome WebDriver: {e}")
             return False
     
+    def _block_media_requests(self) -> None:
+        """Stop the browser from fetching images, media and fonts."""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+        except WebDriverException as e:
+            self.logger.warning(f"Could not block media requests: {e}")
+    
     async def login_to_whatsapp(self) -> bool:
         """Login to WhatsApp Web."""
         try:
@@ -100,7 +368,7 @@ class WhatsAppScraper:
                     return False
             
             # Navigate to WhatsApp Web
-            self.driver.get("https://web.whatsapp.com")
+            await asyncio.to_thread(self.driver.get, "https://web.whatsapp.com")
             self.logger.info("Navigated to WhatsApp Web")
             
             # Wait for either QR code or chat interface
@@ -108,15 +376,16 @@ class WhatsAppScraper:
             
             try:
                 # Check if already logged in
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='chat-list']")))
+                await asyncio.to_thread(wait.until, EC.presence_of_element_located(_SEL_CHAT_LIST))
                 self.is_logged_in = True
+                await asyncio.to_thread(self._open_cdp_channel)
                 self.logger.info("Already logged in to WhatsApp Web")
                 return True
                 
             except TimeoutException:
                 # Need to scan QR code
                 try:
-                    qr_code = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-ref]")))
+                    qr_code = await asyncio.to_thread(wait.until, EC.presence_of_element_located(_SEL_QR_CODE))
                     if qr_code:
                         self.logger.info("QR code detected. Please scan with your phone to login.")
                         
@@ -128,11 +397,12 @@ class WhatsAppScraper:
                             print("="*50 + "\n")
                         
                         # Wait for login completion (QR code disappears)
-                        WebDriverWait(self.driver, 120).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='chat-list']"))
+                        await asyncio.to_thread(
+                            WebDriverWait(self.driver, 120).until, EC.presence_of_element_located(_SEL_CHAT_LIST)
                         )
                         
                         self.is_logged_in = True
+                        await asyncio.to_thread(self._open_cdp_channel)
                         self.logger.info("Successfully logged in to WhatsApp Web")
                         return True
                         
@@ -144,6 +414,34 @@ class WhatsAppScraper:
             self.logger.error(f"Failed to login to WhatsApp Web: {e}")
             return False
     
+    def _open_cdp_channel(self) -> None:
+        """Connect the DevTools channel used for the scraping scripts."""
+        try:
+            debugger_address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+            self._cdp = _CdpChannel(debugger_address)
+        except Exception as e:
+            self.logger.warning(f"DevTools channel unavailable, scripts go through WebDriver: {e}")
+            self._cdp = None
+    
+    def _run_script(self, script: str, *args: Any) -> Any:
+        """Run a JSON-in/JSON-out script, over the DevTools channel when it is open."""
+        if self._cdp is not None:
+            try:
+                return self._cdp.evaluate(script, *args)
+            except (OSError, websocket.WebSocketException) as e:
+                self.logger.warning(f"DevTools channel lost, falling back to WebDriver: {e}")
+                self._close_cdp_channel()
+        return self.driver.execute_script(script, *args)
+    
+    def _close_cdp_channel(self) -> None:
+        """Drop the DevTools channel, if one is open."""
+        if self._cdp is not None:
+            try:
+                self._cdp.close()
+            except Exception:
+                pass
+            self._cdp = None
+    
     async def get_chat_list(self) -> List[Dict[str, Any]]:
         """Get list of available chats."""
         try:
@@ -151,40 +449,21 @@ class WhatsAppScraper:
                 if not await self.login_to_whatsapp():
                     return []
             
-            # Find all chat elements
-            chat_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='cell-frame-container']")
+            async with self._driver_lock:
+                raw_chats = await asyncio.to_thread(self.driver.execute_script, _EXTRACT_CHATS_JS, 20)  # Limit to first 20 chats
             
             chats = []
-            for chat_element in chat_elements[:20]:  # Limit to first 20 chats
-                try:
-                    # Get chat name
-                    name_element = chat_element.find_element(By.CSS_SELECTOR, "[data-testid='conversation-info-header']")
-                    chat_name = name_element.text.strip()
-                    
-                    # Get last message preview (if available)
-                    try:
-                        last_message_element = chat_element.find_element(By.CSS_SELECTOR, "[data-testid='last-msg-preview']")
-                        last_message = last_message_element.text.strip()
-                    except NoSuchElementException:
-                        last_message = ""
-                    
-                    # Get timestamp (if available)
-                    try:
-                        time_element = chat_element.find_element(By.CSS_SELECTOR, "[data-testid='msg-time']")
-                        timestamp_text = time_element.text.strip()
-                    except NoSuchElementException:
-                        timestamp_text = ""
-                    
-                    chats.append({
-                        "name": chat_name,
-                        "last_message": last_message,
-                        "timestamp": timestamp_text,
-                        "element": chat_element
-                    })
-                    
-                except Exception as e:
-                    self.logger.debug(f"Failed to parse chat element: {e}")
+            for chat in raw_chats:
+                if chat["name"] is None:
+                    self.logger.debug("Skipping chat element without a name")
                     continue
+                
+                chats.append({
+                    "name": chat["name"].strip(),
+                    "last_message": (chat["last_message"] or "").strip(),
+                    "timestamp": (chat["time"] or "").strip(),
+                    "element": chat["element"]
+                })
             
             self.logger.info(f"Found {len(chats)} available chats")
             return chats
@@ -195,27 +474,46 @@ class WhatsAppScraper:
     
     async def open_chat(self, chat_name: str) -> bool:
         """Open a specific chat by name."""
+        async with self._driver_lock:
+            return await asyncio.to_thread(self._open_chat_sync, chat_name)
+    
+    def _open_chat_sync(self, chat_name: str) -> bool:
+        """Open a specific chat by name (blocking)."""
         try:
+            # Already showing this chat: skip the search and click
+            if chat_name == self._current_chat and self._run_script(_OPEN_CHAT_TITLE_JS) == chat_name:
+                return True
+            self._current_chat = None
+            
             # Search for the chat
-            search_box = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='chat-list-search']")
+            search_box = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(_SEL_SEARCH))
+            previous_results = self.driver.find_elements(*_SEL_CELL_FRAME)
             search_box.clear()
             search_box.send_keys(chat_name)
             
-            # Wait for search results
-            await asyncio.sleep(2)
+            # Wait for search results: the unfiltered list's first row goes stale once they render.
+            # Capped at the fixed delay this replaces, in case the list reuses its rows.
+            if previous_results:
+                try:
+                    WebDriverWait(self.driver, SEARCH_RESULTS_TIMEOUT, poll_frequency=0.1).until(
+                        EC.staleness_of(previous_results[0])
+                    )
+                except TimeoutException:
+                    pass
             
             # Click on the first result
             try:
-                first_result = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='cell-frame-container']"))
+                first_result = WebDriverWait(self.driver, 10, poll_frequency=0.1).until(
+                    EC.element_to_be_clickable(_SEL_CELL_FRAME)
                 )
                 first_result.click()
                 
                 # Wait for chat to load
                 WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='conversation-header']"))
+                    EC.presence_of_element_located(_SEL_CONV_HEADER)
                 )
                 
+                self._current_chat = chat_name
                 self.logger.info(f"Opened chat: {chat_name}")
                 return True
                 
@@ -224,37 +522,41 @@ class WhatsAppScraper:
                 return False
             
         except Exception as e:
+            self._current_chat = None
             self.logger.error(f"Failed to open chat {chat_name}: {e}")
             return False
     
     async def scrape_chat_messages(self, chat_name: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Scrape messages from a specific chat."""
+        async with self._driver_lock:
+            return await asyncio.to_thread(self.scrape_chat_messages_sync, chat_name, limit)
+    
+    def scrape_chat_messages_sync(self, chat_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Scrape messages from a specific chat (blocking; runs in a worker thread)."""
         try:
-            if not await self.open_chat(chat_name):
+            if not self._open_chat_sync(chat_name):
                 return []
             
             messages = []
             
             # Scroll up to load more messages
-            chat_container = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='conversation-panel-messages']")
-            
-            # Scroll to load messages
-            for _ in range(3):  # Scroll 3 times to load more messages
-                self.driver.execute_script("arguments[0].scrollTop = 0", chat_container)
-                await asyncio.sleep(1)
-            
-            # Get message elements
-            message_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='msg-container']")
-            
-            for msg_element in message_elements[-limit:]:  # Get last N messages
-                try:
-                    message_data = await self._parse_message_element(msg_element, chat_name)
-                    if message_data:
-                        messages.append(message_data)
-                        
-                except Exception as e:
-                    self.logger.debug(f"Failed to parse message element: {e}")
-                    continue
+            chat_container = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(_SEL_CONV_PANEL))
+            
+            # Scroll until no more history loads or enough messages are rendered
+            prev_height = None
+            for _ in range(MAX_SCROLL_ROUNDS):
+                height, count = self.driver.execute_script(_SCROLL_TOP_JS, chat_container)
+                if height == prev_height or count >= limit:
+                    break
+                prev_height = height
+                time.sleep(SCROLL_SETTLE_SECONDS)
+            
+            # Extract the last N messages in one script call, then parse locally
+            now = datetime.now()
+            for raw_message in self._run_script(_EXTRACT_MESSAGES_JS, limit, self.store_raw_html):
+                message_data = self._parse_message_dict(raw_message, chat_name, now)
+                if message_data:
+                    messages.append(message_data)
             
             self.logger.info(f"Scraped {len(messages)} messages from chat: {chat_name}")
             return messages
@@ -263,54 +565,42 @@ class WhatsAppScraper:
             self.logger.error(f"Failed to scrape messages from chat {chat_name}: {e}")
             return []
     
-    async def _parse_message_element(self, msg_element, chat_name: str) -> Optional[Dict[str, Any]]:
-        """Parse a single message element."""
+    def _parse_message_dict(
+        self, raw_message: Dict[str, Any], chat_name: str, now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Parse one message as extracted by _EXTRACT_MESSAGES_JS."""
         try:
-            # Get message text
-            try:
-                text_element = msg_element.find_element(By.CSS_SELECTOR, "[data-testid='msg-text']")
-                message_text = text_element.text.strip()
-            except NoSuchElementException:
+            if now is None:
+                now = datetime.now()
+            
+            # Get message text (media messages may only have a caption)
+            if raw_message["text"] is not None:
+                message_text = raw_message["text"].strip()
+            elif raw_message["caption"] is not None:
+                message_text = raw_message["caption"].strip()
+            else:
                 # Might be a media message or system message
-                try:
-                    media_element = msg_element.find_element(By.CSS_SELECTOR, "[data-testid='media-caption']")
-                    message_text = media_element.text.strip()
-                except NoSuchElementException:
-                    message_text = "[Media or System Message]"
+                message_text = "[Media or System Message]"
             
-            # Get sender information
-            try:
-                sender_element = msg_element.find_element(By.CSS_SELECTOR, "[data-testid='msg-meta']")
-                sender_info = sender_element.get_attribute("data-pre-plain-text") or ""
-                
-                # Parse sender from the format "[HH:MM, DD/MM/YYYY] Sender Name: "
-                if "] " in sender_info:
-                    sender_name = sender_info.split("] ")[1].replace(":", "").strip()
-                else:
-                    sender_name = "Unknown"
-                    
-            except NoSuchElementException:
+            # Parse sender from the format "[HH:MM, DD/MM/YYYY] Sender Name: "
+            sender_match = _SENDER_RE.search(raw_message["meta"] or "")
+            if sender_match:
+                sender_name = sender_match.group(1).replace(":", "").strip()
+            else:
                 sender_name = "Unknown"
             
             # Get timestamp
-            try:
-                time_element = msg_element.find_element(By.CSS_SELECTOR, "[data-testid='msg-time']")
-                timestamp_text = time_element.text.strip()
-                timestamp = self._parse_whatsapp_timestamp(timestamp_text)
-            except NoSuchElementException:
-                timestamp = datetime.now()
-            
-            # Determine if it's an outgoing message
-            is_outgoing = "message-out" in msg_element.get_attribute("class")
-            
-            # Determine message type
-            message_type = "text"
-            if "[Media" in message_text or "image" in msg_element.get_attribute("outerHTML").lower():
+            if raw_message["time"] is not None:
+                timestamp = self._parse_whatsapp_timestamp(raw_message["time"], now)
+            else:
+                timestamp = now
+            
+            # Outgoing flag and media kind are worked out in the page from one outerHTML read
+            is_outgoing = raw_message["outgoing"]
+            if "[Media" in message_text:
                 message_type = "media"
-            elif "audio" in msg_element.get_attribute("outerHTML").lower():
-                message_type = "audio"
-            elif "document" in msg_element.get_attribute("outerHTML").lower():
-                message_type = "document"
+            else:
+                message_type = raw_message["kind"] or "text"
             
             message_data = {
                 "content": clean_text(message_text),
@@ -320,7 +610,7 @@ class WhatsAppScraper:
                 "message_type": message_type,
                 "platform": PlatformType.WHATSAPP,
                 "is_outgoing": is_outgoing,
-                "raw_html": msg_element.get_attribute("outerHTML")[:500]  # Truncated HTML for debugging
+                "raw_html": raw_message["html"]  # Truncated HTML for debugging, None unless store_raw_html
             }
             
             return message_data
@@ -329,112 +619,121 @@ class WhatsAppScraper:
             self.logger.debug(f"Failed to parse message element: {e}")
             return None
     
-    def _parse_whatsapp_timestamp(self, timestamp_text: str) -> datetime:
+    def _parse_whatsapp_timestamp(self, timestamp_text: str, now: Optional[datetime] = None) -> datetime:
         """Parse WhatsApp timestamp format."""
-        try:
-            # WhatsApp shows time in various formats like "12:34", "Yesterday", "DD/MM/YYYY"
+        if now is None:
             now = datetime.now()
-            
-            if ":" in timestamp_text and len(timestamp_text) <= 5:
-                # Format: "HH:MM" (today)
-                time_parts = timestamp_text.split(":")
-                hour = int(time_parts[0])
-                minute = int(time_parts[1])
-                return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            elif timestamp_text.lower() == "yesterday":
-                return now - timedelta(days=1)
-            
-            elif "/" in timestamp_text:
-                # Format: "DD/MM/YYYY" or similar
-                try:
-                    return datetime.strptime(timestamp_text, "%d/%m/%Y")
-                except ValueError:
-                    return now
-            
-            else:
-                return now
-                
-        except Exception:
-            return datetime.now()
+        # Keyed on the minute, so repeated times within a scrape hit the cache and entries age out
+        return _parse_timestamp(timestamp_text.strip(), now.replace(second=0, microsecond=0))
     
     async def monitor_chats(self, callback: Optional[Callable] = None) -> None:
-        """Monitor specified chats for new messages."""
+        """Monitor specified chats for new messages, adding pooled browsers when configured."""
+        pool = WhatsAppScraperPool(first=self)
         try:
-            if not self.is_logged_in:
-                if not await self.login_to_whatsapp():
-                    return
-            
-            self.message_callback = callback
-            monitor_groups = self.config["monitor_groups"]
-            monitor_contacts = self.config["monitor_contacts"]
-            
-            all_chats_to_monitor = monitor_groups + monitor_contacts
-            
-            if not all_chats_to_monitor:
-                self.logger.warning("No chats configured for monitoring")
-                return
-            
-            self.logger.info(f"Starting monitoring for {len(all_chats_to_monitor)} chats")
+            await pool.monitor_chats(callback)
+        finally:
+            # This scraper belongs to the caller; only the extra browsers are the pool's to close
+            await asyncio.gather(*[scraper.close() for scraper in pool.scrapers[1:]])
+    
+    async def check_chat(self, chat_name: str) -> None:
+        """Scrape a chat once, then store and report the messages not seen before."""
+        try:
+            # Get recent messages
+            async with self._driver_lock:
+                messages, drained = await asyncio.to_thread(self._check_chat_sync, chat_name, 10)
+            
+            if drained:
+                # The observer only saw messages added since the last check; several can
+                # share a minute-resolution timestamp, so they must not go through the time filter
+                new_messages = messages
+                self._mark_seen(chat_name, messages)
+            else:
+                # Filter new messages
+                new_messages = self._filter_new_messages(chat_name, messages)
             
-            while True:
-                for chat_name in all_chats_to_monitor:
-                    try:
-                        # Get recent messages
-                        messages = await self.scrape_chat_messages(chat_name, limit=10)
-                        
-                        # Filter new messages
-                        new_messages = self._filter_new_messages(chat_name, messages)
-                        
-                        if new_messages:
-                            self.logger.info(f"Found {len(new_messages)} new messages in {chat_name}")
-                            
-                            # Store in vector database
-                            await self._store_messages_in_db(new_messages)
-                            
-                            # Call callback if provided
-                            if self.message_callback:
-                                for message in new_messages:
-                                    await self.message_callback(message)
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error monitoring chat {chat_name}: {e}")
-                        continue
+            if new_messages:
+                self.logger.info(f"Found {len(new_messages)} new messages in {chat_name}")
                 
-                # Wait before next monitoring cycle
-                await asyncio.sleep(self.platform_config.settings.message_processing_interval)
+                # Store in vector database
+                await self._store_messages_in_db(new_messages)
                 
+                # Call callback if provided
+                if self.message_callback:
+                    await self._deliver_messages(chat_name, new_messages)
+        
         except Exception as e:
-            self.logger.error(f"Error in chat monitoring: {e}")
-            raise
+            self.logger.error(f"Error monitoring chat {chat_name}: {e}")
+    
+    async def _deliver_messages(self, chat_name: str, messages: List[Dict[str, Any]]) -> None:
+        """Hand new messages to the callback: as one list if it takes a batch, else concurrently."""
+        if _takes_message_batch(self.message_callback):
+            await self.message_callback(messages)
+            return
+        
+        results = await asyncio.gather(
+            *(self.message_callback(message) for message in messages), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Message callback failed for {chat_name}: {result}")
+    
+    def _check_chat_sync(self, chat_name: str, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Drain the chat's observer buffer, or rescrape and re-arm it when it is gone.
+        
+        Returns the messages and whether they came from the observer buffer.
+        """
+        try:
+            buffered = self._run_script(_DRAIN_MESSAGES_JS, chat_name, self.store_raw_html)
+        except WebDriverException as e:
+            self.logger.debug(f"Could not drain message buffer for {chat_name}: {e}")
+            buffered = None
+        
+        if buffered is not None:
+            messages = []
+            now = datetime.now()
+            for raw_message in buffered:
+                message_data = self._parse_message_dict(raw_message, chat_name, now)
+                if message_data:
+                    messages.append(message_data)
+            return messages, True
+        
+        # First check, another chat was opened in between, or the page reloaded
+        messages = self.scrape_chat_messages_sync(chat_name, limit)
+        try:
+            self._run_script(_WATCH_MESSAGES_JS, chat_name)
+        except WebDriverException as e:
+            self.logger.debug(f"Could not watch chat {chat_name} for new messages: {e}")
+        return messages, False
     
     def _filter_new_messages(self, chat_name: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter out messages that have already been processed."""
-        if not messages:
-            return []
-        
         last_seen_time = self.last_message_time.get(chat_name, 0)
-        new_messages = []
         
-        latest_time = last_seen_time
+        # Messages arrive in chat (chronological) order, so the newest one decides
+        if not messages or messages[-1]["timestamp"] <= last_seen_time:
+            return []
         
-        for message in messages:
-            message_time = message.get("timestamp", 0)
-            if message_time > last_seen_time:
-                new_messages.append(message)
-                latest_time = max(latest_time, message_time)
+        first_new = bisect_right(messages, last_seen_time, key=itemgetter("timestamp"))
+        new_messages = messages[first_new:]
         
         # Update last seen time
-        if new_messages:
-            self.last_message_time[chat_name] = latest_time
+        self.last_message_time[chat_name] = new_messages[-1]["timestamp"]
         
         return new_messages
     
+    def _mark_seen(self, chat_name: str, messages: List[Dict[str, Any]]) -> None:
+        """Advance the chat's last seen time, so a later rescrape skips these messages."""
+        if messages:
+            newest = max(message["timestamp"] for message in messages)
+            self.last_message_time[chat_name] = max(self.last_message_time.get(chat_name, 0), newest)
+    
     async def _store_messages_in_db(self, messages: List[Dict[str, Any]]) -> None:
         """Store messages in vector database."""
         try:
             if messages:
-                message_ids = self.vector_db.add_messages_batch(messages)
+                columns = {field: [message[field] for message in messages] for field in _VECTOR_DB_FIELDS}
+                # Encoding and the ChromaDB write are blocking; keep them off the event loop
+                message_ids = await asyncio.to_thread(self.vector_db.add_messages_columns, columns)
                 log_scraping_activity("whatsapp", "stored messages in vector DB", len(messages))
                 
         except Exception as e:
@@ -442,13 +741,18 @@ class WhatsAppScraper:
     
     async def send_message(self, chat_name: str, message: str) -> bool:
         """Send a message to a specific chat."""
+        async with self._driver_lock:
+            return await asyncio.to_thread(self._send_message_sync, chat_name, message)
+    
+    def _send_message_sync(self, chat_name: str, message: str) -> bool:
+        """Send a message to a specific chat (blocking)."""
         try:
-            if not await self.open_chat(chat_name):
+            if not self._open_chat_sync(chat_name):
                 return False
             
             # Find message input box
             message_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='msg-input']"))
+                EC.presence_of_element_located(_SEL_MSG_INPUT)
             )
             
             # Type and send message
@@ -456,7 +760,7 @@ class WhatsAppScraper:
             message_box.send_keys(message)
             
             # Find and click send button
-            send_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='send-button']")
+            send_button = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(_SEL_SEND_BUTTON))
             send_button.click()
             
             self.logger.info(f"Sent message to {chat_name}: {message[:50]}...")
@@ -468,15 +772,20 @@ class WhatsAppScraper:
     
     async def get_chat_info(self, chat_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific chat."""
+        async with self._driver_lock:
+            return await asyncio.to_thread(self._get_chat_info_sync, chat_name)
+    
+    def _get_chat_info_sync(self, chat_name: str) -> Optional[Dict[str, Any]]:
+        """Get information about a specific chat (blocking)."""
         try:
-            if not await self.open_chat(chat_name):
+            if not self._open_chat_sync(chat_name):
                 return None
             
             # Click on chat header to open info
-            header = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='conversation-header']")
+            header = self.driver.find_element(*_SEL_CONV_HEADER)
             header.click()
             
-            await asyncio.sleep(2)
+            time.sleep(2)
             
             # Extract chat information
             info = {
@@ -496,18 +805,80 @@ class WhatsAppScraper:
     
     async def close(self):
         """Close the WhatsApp scraper and cleanup."""
+        await asyncio.to_thread(self._quit_driver)
+    
+    def _quit_driver(self) -> None:
+        """Quit the browser once; safe to call again, and registered to run at exit."""
+        self._close_cdp_channel()
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
+        
+        atexit.unregister(self._quit_driver)
+        self.is_logged_in = False
+        self._current_chat = None
         try:
-            if self.driver:
-                self.driver.quit()
-                self.logger.info("WhatsApp scraper closed successfully")
-                
+            driver.quit()
+            self.logger.info("WhatsApp scraper closed successfully")
         except Exception as e:
             self.logger.error(f"Error closing WhatsApp scraper: {e}")
+
+
+class WhatsAppScraperPool:
+    """Several WhatsApp scrapers, each driving its own Chrome profile, monitoring chats in parallel.
     
-    def __del__(self):
-        """Destructor to ensure driver is closed."""
-        if hasattr(self, 'driver') and self.driver:
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
+    Every profile is a separate WhatsApp Web session (linked device) and has to be logged in once.
+    """
+    
+    def __init__(self, size: Optional[int] = None, first: Optional[WhatsAppScraper] = None):
+        self.logger = get_logger("scraper.whatsapp.pool")
+        first = first or WhatsAppScraper()
+        if size is None:
+            size = first.config["browsers"]
+        # The first browser keeps the default profile, so an existing login carries over
+        self.scrapers = [first] + [WhatsAppScraper(profile_name=f"chrome_profile_{i}") for i in range(1, size)]
+    
+    async def monitor_chats(self, callback: Optional[Callable] = None) -> None:
+        """Monitor the configured chats, spreading them over the pooled browsers."""
+        try:
+            logins = await asyncio.gather(*[
+                self._ensure_logged_in(scraper) for scraper in self.scrapers
+            ])
+            scrapers = [scraper for scraper, logged_in in zip(self.scrapers, logins) if logged_in]
+            if not scrapers:
+                self.logger.error("No WhatsApp session in the pool could log in")
+                return
+            
+            all_chats_to_monitor = scrapers[0].chats_to_monitor
+            interval = scrapers[0].monitor_interval
+            if not all_chats_to_monitor:
+                self.logger.warning("No chats configured for monitoring")
+                return
+            
+            for scraper in scrapers:
+                scraper.message_callback = callback
+            
+            # Fixed assignment, so each chat's last-seen time stays with one scraper
+            assignments = list(zip(cycle(scrapers), all_chats_to_monitor))
+            self.logger.info(f"Starting monitoring for {len(all_chats_to_monitor)} chats on {len(scrapers)} browsers")
+            
+            while True:
+                # Chats sharing a browser still take turns on its lock, but storing and
+                # reporting one chat's messages overlaps with scraping the next
+                await asyncio.gather(*[scraper.check_chat(chat_name) for scraper, chat_name in assignments])
+                
+                # Wait before next monitoring cycle
+                await asyncio.sleep(interval)
+        
+        except Exception as e:
+            self.logger.error(f"Error in chat monitoring: {e}")
+            raise
+    
+    @staticmethod
+    async def _ensure_logged_in(scraper: WhatsAppScraper) -> bool:
+        """Log a pooled scraper in unless its session is already up."""
+        return scraper.is_logged_in or await scraper.login_to_whatsapp()
+    
+    async def close(self):
+        """Close every scraper in the pool."""
+        await asyncio.gather(*[scraper.close() for scraper in self.scrapers])
@@ -3,9 +3,12 @@ Configuration management for the Social Agent system.
 """
 
 import os
-from typing import Optional, Dict, Any, List
-from pydantic import Field
-from pydantic_settings import BaseSettings
+import re
+import logging
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, ClassVar
+from pydantic import Field, PrivateAttr
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -21,11 +24,20 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = Field(default="sqlite:///./data/social_agent.db", env="DATABASE_URL")
+    database_echo: bool = Field(default=False, env="DATABASE_ECHO")
+    database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")  # Bounded so bursts can't exhaust max_connections
+    slow_query_ms: float = Field(default=100, env="SLOW_QUERY_MS")  # 0 disables the slow query log
     
     # Vector Database
     vector_db_path: str = Field(default="./data/chroma_db", env="VECTOR_DB_PATH")
     embedding_model: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", env="EMBEDDING_MODEL")
+    embedding_device: Optional[str] = Field(default=None, env="EMBEDDING_DEVICE")  # None = CUDA when available
+    embedding_backend: str = Field(default="torch", env="EMBEDDING_BACKEND")  # torch, onnx or openvino
+    embedding_model_file: Optional[str] = Field(default=None, env="EMBEDDING_MODEL_FILE")  # e.g. a quantized ONNX export
+    embedding_processes: Optional[int] = Field(default=None, env="EMBEDDING_PROCESSES")  # None = one per core on 4+ core CPU hosts
     vector_db_collection: str = Field(default="whatsapp_conversations", env="VECTOR_DB_COLLECTION")
+    vector_db_add_batch_size: int = Field(default=250, env="VECTOR_DB_ADD_BATCH_SIZE")  # Items per collection.add call
     chunk_size: int = Field(default=1000, env="CHUNK_SIZE")
     chunk_overlap: int = Field(default=200, env="CHUNK_OVERLAP")
     
@@ -48,6 +60,9 @@ class Settings(BaseSettings):
     whatsapp_auto_login: bool = Field(default=True, env="WHATSAPP_AUTO_LOGIN")
     whatsapp_headless: bool = Field(default=False, env="WHATSAPP_HEADLESS")
     whatsapp_monitoring_enabled: bool = Field(default=True, env="WHATSAPP_MONITORING_ENABLED")
+    whatsapp_block_media: bool = Field(default=True, env="WHATSAPP_BLOCK_MEDIA")
+    whatsapp_store_raw_html: bool = Field(default=False, env="WHATSAPP_STORE_RAW_HTML")
+    whatsapp_browsers: int = Field(default=1, env="WHATSAPP_BROWSERS")
     
     # WhatsApp Monitoring Configuration
     whatsapp_monitor_groups: str = Field(default="", env="WHATSAPP_MONITOR_GROUPS")
@@ -60,6 +75,7 @@ class Settings(BaseSettings):
     twitter_access_token: Optional[str] = Field(default=None, env="TWITTER_ACCESS_TOKEN")
     twitter_access_token_secret: Optional[str] = Field(default=None, env="TWITTER_ACCESS_TOKEN_SECRET")
     twitter_bearer_token: Optional[str] = Field(default=None, env="TWITTER_BEARER_TOKEN")
+    twitter_bearer_tokens: Optional[str] = Field(default=None, env="TWITTER_BEARER_TOKENS")
     
     instagram_enabled: bool = Field(default=False, env="INSTAGRAM_ENABLED")
     instagram_username: Optional[str] = Field(default=None, env="INSTAGRAM_USERNAME")
@@ -78,6 +94,7 @@ class Settings(BaseSettings):
     sentiment_analysis_enabled: bool = Field(default=True, env="SENTIMENT_ANALYSIS_ENABLED")
     categorization_enabled: bool = Field(default=True, env="CATEGORIZATION_ENABLED")
     response_suggestions_enabled: bool = Field(default=True, env="RESPONSE_SUGGESTIONS_ENABLED")
+    use_textblob: bool = Field(default=False, env="USE_TEXTBLOB")
     sentiment_confidence_threshold: float = Field(default=0.7, env="SENTIMENT_CONFIDENCE_THRESHOLD")
     categorization_confidence_threshold: float = Field(default=0.8, env="CATEGORIZATION_CONFIDENCE_THRESHOLD")
     auto_response_enabled: bool = Field(default=False, env="AUTO_RESPONSE_ENABLED")
@@ -97,136 +114,181 @@ class Settings(BaseSettings):
     cache_size: int = Field(default=1000, env="CACHE_SIZE")
     async_processing: bool = Field(default=True, env="ASYNC_PROCESSING")
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-        extra = "ignore"  # Ignore extra fields in environment
+    # Comma-separated settings, split once after loading
+    _monitor_groups: List[str] = PrivateAttr(default_factory=list)
+    _monitor_contacts: List[str] = PrivateAttr(default_factory=list)
+    _high_priority_keywords: List[str] = PrivateAttr(default_factory=list)
+    _twitter_bearer_tokens: List[str] = PrivateAttr(default_factory=list)
+    # All high priority keywords as one alternation, so a message is scanned once
+    _high_priority_re: Optional[re.Pattern] = PrivateAttr(default=None)
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",  # Ignore extra fields in environment
+    )
+    
+    # Every instance re-reads .env; the one from get_settings() should be the only one
+    _instance_count: ClassVar[int] = 0
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Parse the list-valued settings."""
+        Settings._instance_count += 1
+        if Settings._instance_count > 1:
+            logging.getLogger(__name__).warning(
+                "Settings instantiated again (re-reads .env); use get_settings() instead"
+            )
+        
+        self._monitor_groups = _split_list(self.whatsapp_monitor_groups)
+        self._monitor_contacts = _split_list(self.whatsapp_monitor_contacts)
+        self._high_priority_keywords = [keyword.lower() for keyword in _split_list(self.high_priority_keywords)]
+        if self._high_priority_keywords:
+            keywords = dict.fromkeys(self._high_priority_keywords)
+            self._high_priority_re = re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+        if self.twitter_bearer_tokens:
+            self._twitter_bearer_tokens = _split_list(self.twitter_bearer_tokens)
+        else:
+            self._twitter_bearer_tokens = [self.twitter_bearer_token] if self.twitter_bearer_token else []
     
     def get_whatsapp_monitor_groups(self) -> List[str]:
         """Get list of WhatsApp groups to monitor."""
-        if not self.whatsapp_monitor_groups:
-            return []
-        return [group.strip() for group in self.whatsapp_monitor_groups.split(",") if group.strip()]
+        return self._monitor_groups
     
     def get_whatsapp_monitor_contacts(self) -> List[str]:
         """Get list of WhatsApp contacts to monitor."""
-        if not self.whatsapp_monitor_contacts:
-            return []
-        return [contact.strip() for contact in self.whatsapp_monitor_contacts.split(",") if contact.strip()]
+        return self._monitor_contacts
     
     def get_high_priority_keywords(self) -> List[str]:
         """Get list of high priority keywords."""
-        if not self.high_priority_keywords:
-            return []
-        return [keyword.strip().lower() for keyword in self.high_priority_keywords.split(",") if keyword.strip()]
+        return self._high_priority_keywords
+    
+    def is_high_priority(self, text: str) -> bool:
+        """Check whether text contains any high priority keyword (case-insensitive substring).
+        
+        Prefer this over ``any(keyword in text for keyword in get_high_priority_keywords())``.
+        """
+        return bool(text and self._high_priority_re and self._high_priority_re.search(text))
+    
+    def get_twitter_bearer_tokens(self) -> List[str]:
+        """Get the pool of Twitter bearer tokens (falls back to the single token)."""
+        return self._twitter_bearer_tokens
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated setting into its non-empty, stripped items."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
 
 
 class PlatformConfig:
     """Configuration for social media platforms."""
     
+    PLATFORMS = ("whatsapp", "twitter", "instagram", "linkedin")
+    
     def __init__(self, settings: Settings):
         self.settings = settings
+        
+        # Settings are loaded once, so the per-platform dicts are too
+        self._openai_config = {
+            "api_key": settings.openai_api_key,
+            "model": settings.openai_model,
+            "temperature": settings.openai_temperature,
+            "max_tokens": settings.openai_max_tokens,
+            "timeout": settings.openai_timeout,
+            "fallback_model": settings.fallback_model,
+        }
+        self._whatsapp_config = {
+            "phone_number": settings.whatsapp_phone_number,
+            "session_path": settings.whatsapp_session_path,
+            "chrome_path": settings.whatsapp_chrome_path,
+            "auto_login": settings.whatsapp_auto_login,
+            "headless": settings.whatsapp_headless,
+            "monitoring_enabled": settings.whatsapp_monitoring_enabled,
+            "block_media": settings.whatsapp_block_media,
+            "store_raw_html": settings.whatsapp_store_raw_html,
+            "browsers": max(1, settings.whatsapp_browsers),
+            "monitor_groups": settings.get_whatsapp_monitor_groups(),
+            "monitor_contacts": settings.get_whatsapp_monitor_contacts(),
+        }
+        self._twitter_config = {
+            "enabled": settings.twitter_enabled,
+            "api_key": settings.twitter_api_key,
+            "api_secret": settings.twitter_api_secret,
+            "access_token": settings.twitter_access_token,
+            "access_token_secret": settings.twitter_access_token_secret,
+            "bearer_token": settings.twitter_bearer_token,
+            "bearer_tokens": settings.get_twitter_bearer_tokens(),
+        }
+        self._instagram_config = {
+            "enabled": settings.instagram_enabled,
+            "username": settings.instagram_username,
+            "password": settings.instagram_password,
+        }
+        self._linkedin_config = {
+            "enabled": settings.linkedin_enabled,
+            "username": settings.linkedin_username,
+            "password": settings.linkedin_password,
+        }
+        self._enabled_platforms = tuple(
+            platform for platform in self.PLATFORMS if self._check_platform(platform)
+        )
     
     def get_openai_config(self) -> Dict[str, Any]:
         """Get OpenAI configuration."""
-        return {
-            "api_key": self.settings.openai_api_key,
-            "model": self.settings.openai_model,
-            "temperature": self.settings.openai_temperature,
-            "max_tokens": self.settings.openai_max_tokens,
-            "timeout": self.settings.openai_timeout,
-            "fallback_model": self.settings.fallback_model,
-        }
+        return self._openai_config
     
     def get_whatsapp_config(self) -> Dict[str, Any]:
         """Get WhatsApp configuration."""
-        return {
-            "phone_number": self.settings.whatsapp_phone_number,
-            "session_path": self.settings.whatsapp_session_path,
-            "chrome_path": self.settings.whatsapp_chrome_path,
-            "auto_login": self.settings.whatsapp_auto_login,
-            "headless": self.settings.whatsapp_headless,
-            "monitoring_enabled": self.settings.whatsapp_monitoring_enabled,
-            "monitor_groups": self.settings.get_whatsapp_monitor_groups(),
-            "monitor_contacts": self.settings.get_whatsapp_monitor_contacts(),
-        }
+        return self._whatsapp_config
     
     def get_twitter_config(self) -> Dict[str, Any]:
         """Get Twitter API configuration."""
-        return {
-            "enabled": self.settings.twitter_enabled,
-            "api_key": self.settings.twitter_api_key,
-            "api_secret": self.settings.twitter_api_secret,
-            "access_token": self.settings.twitter_access_token,
-            "access_token_secret": self.settings.twitter_access_token_secret,
-            "bearer_token": self.settings.twitter_bearer_token,
-        }
+        return self._twitter_config
     
     def get_instagram_config(self) -> Dict[str, Any]:
         """Get Instagram configuration."""
-        return {
-            "enabled": self.settings.instagram_enabled,
-            "username": self.settings.instagram_username,
-            "password": self.settings.instagram_password,
-        }
+        return self._instagram_config
     
     def get_linkedin_config(self) -> Dict[str, Any]:
         """Get LinkedIn configuration."""
-        return {
-            "enabled": self.settings.linkedin_enabled,
-            "username": self.settings.linkedin_username,
-            "password": self.settings.linkedin_password,
-        }
+        return self._linkedin_config
     
-    def is_platform_configured(self, platform: str) -> bool:
-        """Check if a platform is properly configured."""
-        if platform.lower() == "whatsapp":
-            config = self.get_whatsapp_config()
-            return bool(config["phone_number"] and config["monitoring_enabled"])
+    def _check_platform(self, platform: str) -> bool:
+        """Check a platform's required settings directly."""
+        settings = self.settings
+        if platform == "whatsapp":
+            return bool(settings.whatsapp_phone_number and settings.whatsapp_monitoring_enabled)
         
-        elif platform.lower() == "twitter":
-            config = self.get_twitter_config()
-            return bool(config["enabled"] and config["api_key"] and config["api_secret"])
+        elif platform == "twitter":
+            return bool(settings.twitter_enabled and settings.twitter_api_key and settings.twitter_api_secret)
         
-        elif platform.lower() == "instagram":
-            config = self.get_instagram_config()
-            return bool(config["enabled"] and config["username"] and config["password"])
+        elif platform == "instagram":
+            return bool(settings.instagram_enabled and settings.instagram_username and settings.instagram_password)
         
-        elif platform.lower() == "linkedin":
-            config = self.get_linkedin_config()
-            return bool(config["enabled"] and config["username"] and config["password"])
+        elif platform == "linkedin":
+            return bool(settings.linkedin_enabled and settings.linkedin_username and settings.linkedin_password)
         
         return False
     
+    def is_platform_configured(self, platform: str) -> bool:
+        """Check if a platform is properly configured."""
+        return platform.lower() in self._enabled_platforms
+    
     def get_enabled_platforms(self) -> List[str]:
         """Get list of enabled social media platforms."""
-        enabled = []
-        
-        if self.is_platform_configured("whatsapp"):
-            enabled.append("whatsapp")
-        
-        if self.is_platform_configured("twitter"):
-            enabled.append("twitter")
-        
-        if self.is_platform_configured("instagram"):
-            enabled.append("instagram")
-        
-        if self.is_platform_configured("linkedin"):
-            enabled.append("linkedin")
-        
-        return enabled
-
-
-# Global settings instance
-settings = Settings()
-platform_config = PlatformConfig(settings)
+        return list(self._enabled_platforms)
 
 
+# The accessors are the only way to the shared instances; each is built on first use
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings."""
-    return settings
+    return Settings()
 
 
+@lru_cache(maxsize=1)
 def get_platform_config() -> PlatformConfig:
     """Get platform configuration."""
-    return platform_config
+    return PlatformConfig(get_settings())
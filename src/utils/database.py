@@ -3,39 +3,113 @@ Database configuration and connection management.
 """
 
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+import asyncio
+import threading
+import time
+import orjson
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, List
 
 from src.models import Base
+from src.utils.config import get_settings
+
+# WAL lets readers run during writes and batches fsyncs; the rest trade memory for I/O
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",  # 256 MiB
+    "cache_size=-64000",  # ~64 MB (negative values are KiB)
+)
+
+# Rows per executemany INSERT in bulk_insert; keeps bound-parameter lists bounded
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _session_scope_key():
+    """Scope sessions to the running asyncio task, falling back to the thread."""
+    try:
+        return asyncio.current_task() or threading.get_ident()
+    except RuntimeError:
+        return threading.get_ident()
+
+
+def _json_serializer(obj) -> str:
+    """Serialize JSON columns with orjson (numpy values included)."""
+    return orjson.dumps(
+        obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
 
 
 class DatabaseManager:
     """Manages database connections and sessions."""
     
     def __init__(self, database_url: str = None):
+        settings = get_settings()
         if database_url is None:
-            database_url = os.getenv("DATABASE_URL", "sqlite:///./data/social_agent.db")
+            database_url = settings.database_url
         
         self.database_url = database_url
+        self.is_sqlite = database_url.startswith("sqlite")
         
         # Create engine with appropriate settings
-        if database_url.startswith("sqlite"):
+        if self.is_sqlite:
             self.engine = create_engine(
                 database_url,
                 connect_args={"check_same_thread": False},
                 poolclass=StaticPool,
-                echo=os.getenv("DATABASE_ECHO", "False").lower() == "true"
+                json_serializer=_json_serializer,
+                json_deserializer=orjson.loads,
+                echo=settings.database_echo
             )
+            self._install_sqlite_pragmas()
         else:
             self.engine = create_engine(
                 database_url,
-                echo=os.getenv("DATABASE_ECHO", "False").lower() == "true"
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,  # Absorb bursts of concurrent agent tasks, up to a limit
+                pool_pre_ping=True,  # Replace connections the server dropped while idle
+                pool_recycle=1800,
+                json_serializer=_json_serializer,
+                json_deserializer=orjson.loads,
+                echo=settings.database_echo
             )
         
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        if settings.slow_query_ms > 0:
+            self._install_slow_query_log(settings.slow_query_ms / 1000)
+        
+        # Keep loaded attributes after commit so results stay readable once the session closes
+        self.SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine
+        )
+        self.ScopedSession = scoped_session(self.SessionLocal, scopefunc=_session_scope_key)
+    
+    def _install_sqlite_pragmas(self):
+        """Tune every new SQLite connection for a write-heavy store."""
+        @event.listens_for(self.engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(f"PRAGMA {pragma}")
+            cursor.close()
+    
+    def _install_slow_query_log(self, threshold: float):
+        """Log every statement that takes longer than ``threshold`` seconds."""
+        from src.utils.logging import get_logger
+        slow_logger = get_logger("db.slow")
+        
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _start_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info["query_start_time"] = time.perf_counter()
+        
+        @event.listens_for(self.engine, "after_cursor_execute")
+        def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info.pop("query_start_time", time.perf_counter())
+            if elapsed > threshold:
+                slow_logger.warning(f"Slow query ({elapsed * 1000:.0f} ms): {statement}")
     
     def create_tables(self):
         """Create all database tables."""
@@ -49,6 +123,14 @@ class DatabaseManager:
         """Get a database session."""
         return self.SessionLocal()
     
+    def get_scoped_session(self) -> Session:
+        """Get the session bound to the current asyncio task (or thread)."""
+        return self.ScopedSession()
+    
+    def remove_scoped_session(self):
+        """Close and discard the session bound to the current asyncio task."""
+        self.ScopedSession.remove()
+    
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """Provide a transactional scope around a series of operations."""
@@ -61,6 +143,17 @@ class DatabaseManager:
             raise
         finally:
             session.close()
+    
+    def bulk_insert(self, model, rows: List[Dict[str, Any]], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> int:
+        """Insert plain row dicts with executemany INSERTs in one transaction, skipping the ORM unit of work."""
+        if not rows:
+            return 0
+        
+        with self.session_scope() as session:
+            for start in range(0, len(rows), chunk_size):
+                session.execute(insert(model), rows[start:start + chunk_size])
+        
+        return len(rows)
 
 
 # Global database manager instance
@@ -68,11 +161,23 @@ db_manager = DatabaseManager()
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Dependency for FastAPI to get database session."""
+    """Dependency for FastAPI to get a read-write database session."""
     with db_manager.session_scope() as session:
         yield session
 
 
+get_db_rw = get_db
+
+
+def get_db_ro() -> Generator[Session, None, None]:
+    """Dependency for FastAPI to get a read-only session (no commit on exit)."""
+    session = db_manager.get_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def init_database():
     """Initialize the database with tables."""
     # Ensure data directory exists
@@ -4,10 +4,75 @@ Utility functions for the Social Agent system.
 
 import re
 import hashlib
-from typing import List, Dict, Any, Optional
+from bisect import bisect_right
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from datetime import datetime, timezone
 from urllib.parse import urlparse
-import json
+import numpy as np
+import orjson
+
+# Patterns used on every message, compiled once
+_HASHTAG_RE = re.compile(r'#\w+', re.IGNORECASE)
+_MENTION_RE_DEFAULT = re.compile(r'@\w+', re.IGNORECASE)
+_MENTION_RES = {
+    "twitter": _MENTION_RE_DEFAULT,
+    "instagram": re.compile(r'@[\w.]+', re.IGNORECASE),
+    "linkedin": re.compile(r'@[\w\s]+', re.IGNORECASE),
+}
+_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# Hashtags, mentions and URLs in one scan; URLs come first so tags inside them aren't split out
+_ENTITY_RES = {
+    platform: re.compile(
+        f"(?P<url>{_URL_RE.pattern})|(?P<hashtag>{_HASHTAG_RE.pattern})|(?P<mention>{mention_re.pattern})",
+        re.IGNORECASE
+    )
+    for platform, mention_re in {**_MENTION_RES, "default": _MENTION_RE_DEFAULT}.items()
+}
+
+_WS_RE = re.compile(r'\s+')
+_SPECIAL_RE = re.compile(r'[^\w\s.,!?;:\-@#]')
+_FILENAME_INVALID_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+_DOTS_RE = re.compile(r'\.+')
+# Cheap necessary condition for validate_url: something shaped like "scheme://"
+_URL_PREFILTER_RE = re.compile(r'[a-z][a-z0-9+.\-]*://', re.IGNORECASE)
+_WORD_RE = re.compile(r'\b\w+\b')
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U00002702-\U000027B0"
+    "\U000024C2-\U0001F251"
+    "]+",
+    flags=re.UNICODE
+)
+
+# Fallback layouts for normalize_datetime
+_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+)
+
+# format_large_number: thresholds ascending, with their suffixes
+_NUMBER_SCALES = (1_000, 1_000_000, 1_000_000_000)
+_NUMBER_SUFFIXES = ("K", "M", "B")
+
+# Common stop words dropped by TextProcessor.extract_keywords
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him',
+    'her', 'us', 'them'
+})
 
 
 def extract_hashtags(text: str) -> List[str]:
@@ -15,8 +80,7 @@ def extract_hashtags(text: str) -> List[str]:
     if not text:
         return []
     
-    hashtag_pattern = r'#\w+'
-    hashtags = re.findall(hashtag_pattern, text, re.IGNORECASE)
+    hashtags = _HASHTAG_RE.findall(text)
     return [tag.lower() for tag in hashtags]
 
 
@@ -25,16 +89,7 @@ def extract_mentions(text: str, platform: str = "twitter") -> List[str]:
     if not text:
         return []
     
-    if platform.lower() == "twitter":
-        mention_pattern = r'@\w+'
-    elif platform.lower() == "instagram":
-        mention_pattern = r'@[\w.]+'
-    elif platform.lower() == "linkedin":
-        mention_pattern = r'@[\w\s]+'
-    else:
-        mention_pattern = r'@\w+'
-    
-    mentions = re.findall(mention_pattern, text, re.IGNORECASE)
+    mentions = _MENTION_RES.get(platform.lower(), _MENTION_RE_DEFAULT).findall(text)
     return [mention.lower() for mention in mentions]
 
 
@@ -43,9 +98,25 @@ def extract_urls(text: str) -> List[str]:
     if not text:
         return []
     
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls = re.findall(url_pattern, text)
-    return urls
+    return _URL_RE.findall(text)
+
+
+def extract_entities(text: str, platform: str = "twitter") -> Dict[str, List[str]]:
+    """Extract hashtags, mentions and URLs from text in a single pass."""
+    entities = {"hashtags": [], "mentions": [], "urls": []}
+    if not text:
+        return entities
+    
+    pattern = _ENTITY_RES.get(platform.lower(), _ENTITY_RES["default"])
+    for match in pattern.finditer(text):
+        kind = match.lastgroup
+        if kind == "url":
+            entities["urls"].append(match.group())
+        elif kind == "hashtag":
+            entities["hashtags"].append(match.group().lower())
+        else:
+            entities["mentions"].append(match.group().lower())
+    return entities
 
 
 def clean_text(text: str) -> str:
@@ -53,13 +124,8 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?;:\-@#]', '', text)
-    
-    return text.strip()
+    # Remove special characters but keep basic punctuation, then collapse whitespace
+    return " ".join(_SPECIAL_RE.sub('', text).split())
 
 
 def generate_post_hash(post_data: Dict[str, Any]) -> str:
@@ -67,29 +133,28 @@ def generate_post_hash(post_data: Dict[str, Any]) -> str:
     # Create a string representation of key post data
     hash_string = f"{post_data.get('platform', '')}-{post_data.get('post_id', '')}-{post_data.get('content', '')}"
     
-    # Generate MD5 hash
-    return hashlib.md5(hash_string.encode()).hexdigest()
+    # BLAKE2b with a 16-byte digest: still 32 hex chars, and cheaper than MD5
+    return hashlib.blake2b(hash_string.encode(), digest_size=16).hexdigest()
+
+
+def _parse_datetime_formats(value: str) -> datetime:
+    """Parse the looser layouts fromisoformat rejects (e.g. unpadded fields)."""
+    for fmt in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unable to parse datetime string: {value}")
 
 
 def normalize_datetime(dt: Any) -> datetime:
     """Normalize various datetime formats to UTC datetime."""
     if isinstance(dt, str):
-        # Try to parse common datetime formats
-        for fmt in [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%d %H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-        ]:
-            try:
-                dt = datetime.strptime(dt, fmt)
-                break
-            except ValueError:
-                continue
-        else:
-            raise ValueError(f"Unable to parse datetime string: {dt}")
+        try:
+            # ISO 8601 (what the platform APIs send), "Z" suffix included
+            dt = datetime.fromisoformat(dt)
+        except ValueError:
+            dt = _parse_datetime_formats(dt)
     
     # Ensure timezone awareness
     if dt.tzinfo is None:
@@ -106,6 +171,8 @@ def normalize_datetime(dt: Any) -> datetime:
 def validate_url(url: str) -> bool:
     """Validate if a string is a valid URL."""
     try:
+        if not url or not _URL_PREFILTER_RE.search(url):
+            return False
         result = urlparse(url)
         return all([result.scheme, result.netloc])
     except Exception:
@@ -115,11 +182,11 @@ def validate_url(url: str) -> bool:
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename by removing invalid characters."""
     # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = filename.translate(_FILENAME_INVALID_TRANS)
     
     # Remove extra spaces and dots
-    filename = re.sub(r'\s+', '_', filename)
-    filename = re.sub(r'\.+', '.', filename)
+    filename = _WS_RE.sub('_', filename)
+    filename = _DOTS_RE.sub('.', filename)
     
     # Limit length
     if len(filename) > 255:
@@ -129,24 +196,28 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
-    """Split a list into chunks of specified size."""
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+def chunk_list(lst: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """Split a list (or any iterable) into chunks of specified size, one chunk at a time."""
+    iterator = iter(lst)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
 
 
 def safe_json_loads(json_str: str, default: Any = None) -> Any:
     """Safely load JSON string, returning default value on error."""
     try:
-        return json.loads(json_str) if json_str else default
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(json_str) if json_str else default
+    except (orjson.JSONDecodeError, TypeError):
         return default
 
 
 def safe_json_dumps(obj: Any, default: str = "{}") -> str:
     """Safely dump object to JSON string, returning default on error."""
     try:
-        return json.dumps(obj, default=str)
-    except (TypeError, ValueError):
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    except (orjson.JSONEncodeError, TypeError, ValueError):
         return default
 
 
@@ -159,6 +230,19 @@ def calculate_engagement_rate(likes: int, comments: int, shares: int, followers:
     return (total_engagement / followers) * 100
 
 
+def calculate_engagement_rate_batch(likes, comments, shares, followers) -> np.ndarray:
+    """Vectorized ``calculate_engagement_rate`` over array-likes (0.0 where followers is 0)."""
+    followers = np.asarray(followers, dtype=np.float64)
+    total_engagement = (
+        np.asarray(likes, dtype=np.float64)
+        + np.asarray(comments, dtype=np.float64)
+        + np.asarray(shares, dtype=np.float64)
+    )
+    rates = np.zeros(np.broadcast(total_engagement, followers).shape)
+    np.divide(total_engagement, followers, out=rates, where=followers != 0)
+    return rates * 100
+
+
 def get_platform_emoji(platform: str) -> str:
     """Get emoji for platform."""
     platform_emojis = {
@@ -172,14 +256,10 @@ def get_platform_emoji(platform: str) -> str:
 
 def format_large_number(num: int) -> str:
     """Format large numbers with K, M, B suffixes."""
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.1f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.1f}K"
-    else:
+    scale = bisect_right(_NUMBER_SCALES, num)
+    if scale == 0:
         return str(num)
+    return f"{num / _NUMBER_SCALES[scale - 1]:.1f}{_NUMBER_SUFFIXES[scale - 1]}"
 
 
 class TextProcessor:
@@ -188,18 +268,7 @@ class TextProcessor:
     @staticmethod
     def remove_emojis(text: str) -> str:
         """Remove emojis from text."""
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "]+",
-            flags=re.UNICODE
-        )
-        return emoji_pattern.sub(r'', text)
+        return _EMOJI_RE.sub('', text)
     
     @staticmethod
     def extract_keywords(text: str, min_length: int = 3) -> List[str]:
@@ -208,21 +277,10 @@ class TextProcessor:
             return []
         
         # Convert to lowercase and split into words
-        words = re.findall(r'\b\w+\b', text.lower())
+        words = _WORD_RE.findall(text.lower())
         
-        # Filter words by length and remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these',
-            'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him',
-            'her', 'us', 'them'
-        }
-        
-        keywords = [
+        # Filter words by length and remove common stop words; dedupe keeping first-seen order
+        return list(dict.fromkeys(
             word for word in words
-            if len(word) >= min_length and word not in stop_words
-        ]
-        
-        return list(set(keywords))  # Remove duplicates
+            if len(word) >= min_length and word not in _STOP_WORDS
+        ))
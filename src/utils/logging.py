@@ -3,14 +3,62 @@ Logging configuration for the Social Agent system.
 """
 
 import os
+import atexit
+import queue
 import logging
 import logging.handlers
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from datetime import datetime
 
 from src.utils.config import get_settings
 
 
+@lru_cache(maxsize=None)
+def _shared_handlers() -> Tuple[logging.Handler, ...]:
+    """Create the handlers every logger shares (the log file is opened once).
+    
+    Loggers only get a QueueHandler; a background QueueListener thread owns the
+    console and rotating file handlers, so callers never wait on terminal or disk I/O.
+    """
+    settings = get_settings()
+    log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
+    
+    # Create formatter
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(formatter)
+    handlers = [console_handler]
+    
+    # File handler
+    if settings.log_file:
+        # Ensure log directory exists
+        log_dir = os.path.dirname(settings.log_file)
+        os.makedirs(log_dir, exist_ok=True)
+        
+        # Create rotating file handler
+        file_handler = logging.handlers.RotatingFileHandler(
+            settings.log_file,
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5
+        )
+        file_handler.setLevel(log_level)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on shutdown
+    
+    return (logging.handlers.QueueHandler(log_queue),)
+
+
 class SocialAgentLogger:
     """Custom logger for the Social Agent system."""
     
@@ -28,32 +76,9 @@ class SocialAgentLogger:
         log_level = getattr(logging, self.settings.log_level.upper(), logging.INFO)
         self.logger.setLevel(log_level)
         
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
-        
-        # File handler
-        if self.settings.log_file:
-            # Ensure log directory exists
-            log_dir = os.path.dirname(self.settings.log_file)
-            os.makedirs(log_dir, exist_ok=True)
-            
-            # Create rotating file handler
-            file_handler = logging.handlers.RotatingFileHandler(
-                self.settings.log_file,
-                maxBytes=10 * 1024 * 1024,  # 10MB
-                backupCount=5
-            )
-            file_handler.setLevel(log_level)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+        # Every named logger writes through the same console and file handlers
+        for handler in _shared_handlers():
+            self.logger.addHandler(handler)
         
         # Prevent propagation to root logger
         self.logger.propagate = False
@@ -68,8 +93,9 @@ _main_logger = SocialAgentLogger("social_agent")
 logger = _main_logger.get_logger()
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str = "social_agent") -> logging.Logger:
-    """Get a logger with the specified name."""
+    """Get a logger with the specified name (configured on first request only)."""
     if name == "social_agent":
         return logger
     else:
@@ -79,31 +105,36 @@ def get_logger(name: str = "social_agent") -> logging.Logger:
 
 def log_agent_activity(agent_name: str, activity: str, details: Optional[dict] = None):
     """Log agent activity with structured information."""
-    log_message = f"Agent '{agent_name}': {activity}"
-    if details:
-        log_message += f" - Details: {details}"
-    
+    # %-style arguments: details are only formatted if the record is emitted
     agent_logger = get_logger(f"agent.{agent_name}")
-    agent_logger.info(log_message)
+    if details:
+        agent_logger.info("Agent '%s': %s - Details: %s", agent_name, activity, details)
+    else:
+        agent_logger.info("Agent '%s': %s", agent_name, activity)
 
 
 def log_scraping_activity(platform: str, action: str, count: int = 0, details: Optional[dict] = None):
     """Log scraping activity."""
-    log_message = f"Scraping {platform}: {action}"
+    scraper_logger = get_logger(f"scraper.{platform}")
+    if not scraper_logger.isEnabledFor(logging.INFO):
+        return
+    
+    log_format = "Scraping %s: %s"
+    args = [platform, action]
     if count > 0:
-        log_message += f" (count: {count})"
+        log_format += " (count: %d)"
+        args.append(count)
     if details:
-        log_message += f" - Details: {details}"
+        log_format += " - Details: %s"
+        args.append(details)
     
-    scraper_logger = get_logger(f"scraper.{platform}")
-    scraper_logger.info(log_message)
+    scraper_logger.info(log_format, *args)
 
 
 def log_analysis_activity(analysis_type: str, post_id: str, result: Optional[dict] = None):
     """Log analysis activity."""
-    log_message = f"Analysis '{analysis_type}' for post {post_id}"
-    if result:
-        log_message += f" - Result: {result}"
-    
     analysis_logger = get_logger(f"analysis.{analysis_type}")
-    analysis_logger.info(log_message)
+    if result:
+        analysis_logger.info("Analysis '%s' for post %s - Result: %s", analysis_type, post_id, result)
+    else:
+        analysis_logger.info("Analysis '%s' for post %s", analysis_type, post_id)
@@ -4,9 +4,18 @@ Vector database management using ChromaDB for efficient conversation storage and
 
 import os
 import json
+import sqlite3
+import asyncio
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import chromadb
+import numpy as np
+import torch
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 import hashlib
@@ -14,13 +23,62 @@ import hashlib
 from src.utils.config import get_settings
 from src.utils.logging import get_logger
 
+# Texts per transformer forward pass when embedding a batch of messages
+EMBEDDING_BATCH_SIZE = 64
+
+# Batches at least this large are spread over the multi-process CPU encoding pool
+MULTI_PROCESS_MIN_BATCH = 256
+MULTI_PROCESS_MIN_CORES = 4
+
+# Documents encoded per step of add_messages_batch_async; the next window encodes while the last is written
+ASYNC_ENCODE_WINDOW = 1024
+
+# FP16 Tensor Core kernels need sequence lengths that are a multiple of this
+TENSOR_CORE_PAD_MULTIPLE = 8
+
+# Recently embedded documents kept so re-ingested messages (retries, duplicate deliveries) skip the encoder
+DOCUMENT_EMBEDDING_CACHE_SIZE = 10_000
+
+# Seconds a cached collection count is trusted (covers writers in other processes)
+COLLECTION_COUNT_TTL = 5.0
+
+# Side index for metadata-only lookups (time windows per group/sender), kept next to the ChromaDB files
+_METADATA_INDEX_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS message_meta ("
+    "id TEXT PRIMARY KEY, sender TEXT, group_name TEXT, ts REAL, platform TEXT, sentiment TEXT)",
+    "CREATE INDEX IF NOT EXISTS ix_message_meta_group_ts ON message_meta (group_name, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_message_meta_sender_ts ON message_meta (sender, ts)",
+)
+_METADATA_INDEX_BACKFILL_PAGE = 1000
+
+# Distinct search queries whose embeddings are kept (repeated queries skip the encoder)
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+
+def _available_cores() -> int:
+    """Number of CPU cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _chroma_where(where: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Adapt a plain field -> condition filter to ChromaDB's syntax (None when empty, $and for several fields)."""
+    if not where:
+        return None
+    if len(where) == 1:
+        return where
+    return {"$and": [{key: value} for key, value in where.items()]}
+
 
 class VectorDatabaseManager:
     """Manages vector database operations for conversation storage and retrieval."""
     
-    def __init__(self):
+    def __init__(self, batch_size: int = EMBEDDING_BATCH_SIZE):
         self.settings = get_settings()
         self.logger = get_logger("vector_db")
+        self.batch_size = batch_size
         
         # Initialize ChromaDB
         self.db_path = self.settings.vector_db_path
@@ -34,8 +92,32 @@ class VectorDatabaseManager:
             )
         )
         
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(self.settings.embedding_model)
+        # Embedding model runs on the GPU when one is available; it is loaded on first use
+        self.device = self.settings.embedding_device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self._embedding_model: Optional[SentenceTransformer] = None
+        self._model_lock = threading.Lock()
+        
+        # CPU-only hosts encode large batches in worker processes; the pool starts on first use
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._pool_size = 0
+        if self.device == "cpu":
+            processes = self.settings.embedding_processes
+            if processes is None:
+                cores = _available_cores()
+                processes = cores if cores >= MULTI_PROCESS_MIN_CORES else 0
+            self._pool_size = processes if processes > 1 else 0
+        
+        # Query embeddings depend only on the text and the model, so they never go stale
+        self._embed_query = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(self._encode_query)
+        
+        # Document text -> embedding row, least recently used first
+        self._document_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._document_embeddings_lock = threading.Lock()
+        
+        # collection.count() result, dropped by every write through this manager
+        self._count_cache: Optional[int] = None
+        self._count_cached_at = 0.0
         
         # Get or create collection
         self.collection_name = self.settings.vector_db_collection
@@ -54,6 +136,8 @@ class VectorDatabaseManager:
             except Exception as create_error:
                 self.logger.error(f"Failed to create collection {self.collection_name}: {create_error}")
                 raise
+        
+        self._open_metadata_index()
     
     def add_message(self, message_data: Dict[str, Any]) -> str:
         """Add a single message to the vector database."""
@@ -65,18 +149,20 @@ class VectorDatabaseManager:
             text_content = self._prepare_text_for_embedding(message_data)
             
             # Generate embedding
-            embedding = self.embedding_model.encode(text_content).tolist()
+            embedding = self._encode_documents([text_content])[0]
             
             # Prepare metadata
             metadata = self._prepare_metadata(message_data)
             
             # Add to collection
+            self._invalidate_count()
             self.collection.add(
                 embeddings=[embedding],
                 documents=[text_content],
                 metadatas=[metadata],
                 ids=[message_id]
             )
+            self._index_metadata([message_id], [metadata])
             
             self.logger.debug(f"Added message {message_id} to vector database")
             return message_id
@@ -91,35 +177,23 @@ class VectorDatabaseManager:
             if not messages:
                 return []
             
-            ids = []
-            embeddings = []
-            documents = []
-            metadatas = []
+            # Bind the per-message helpers once instead of looking them up per row
+            generate_id = self._generate_message_id
+            prepare_metadata = self._prepare_metadata
+            prepare_text = self._prepare_text_for_embedding
             
-            for message_data in messages:
-                # Generate unique ID
-                message_id = self._generate_message_id(message_data)
-                ids.append(message_id)
-                
-                # Prepare text for embedding
-                text_content = self._prepare_text_for_embedding(message_data)
-                documents.append(text_content)
-                
-                # Generate embedding
-                embedding = self.embedding_model.encode(text_content).tolist()
-                embeddings.append(embedding)
-                
-                # Prepare metadata
-                metadata = self._prepare_metadata(message_data)
-                metadatas.append(metadata)
+            # Messages without a timestamp share one "now" per batch
+            now_timestamp = datetime.now().timestamp()
+            
+            ids = [generate_id(message_data) for message_data in messages]
+            metadatas = [prepare_metadata(message_data, now_timestamp) for message_data in messages]
+            
+            # Embed every message in one batched encode call
+            documents = [prepare_text(message_data) for message_data in messages]
+            embeddings = self._encode_documents(documents)
             
             # Add batch to collection
-            self.collection.add(
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            self._add_to_collection(ids, embeddings, documents, metadatas)
             
             self.logger.info(f"Added {len(messages)} messages to vector database")
             return ids
@@ -128,6 +202,125 @@ class VectorDatabaseManager:
             self.logger.error(f"Failed to add messages batch to vector database: {e}")
             raise
     
+    async def add_messages_batch_async(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Add multiple messages without blocking the event loop, overlapping encoding with writes."""
+        try:
+            if not messages:
+                return []
+            
+            now_timestamp = datetime.now().timestamp()
+            ids = [self._generate_message_id(message_data) for message_data in messages]
+            metadatas = [self._prepare_metadata(message_data, now_timestamp) for message_data in messages]
+            documents = [self._prepare_text_for_embedding(message_data) for message_data in messages]
+            
+            pending_write = None
+            try:
+                for start in range(0, len(documents), ASYNC_ENCODE_WINDOW):
+                    end = start + ASYNC_ENCODE_WINDOW
+                    embeddings = await asyncio.to_thread(self._encode_documents, documents[start:end])
+                    
+                    # Wait for the previous window's write only once this one is encoded
+                    if pending_write is not None:
+                        await pending_write
+                    pending_write = asyncio.ensure_future(asyncio.to_thread(
+                        self._add_to_collection,
+                        ids[start:end], embeddings, documents[start:end], metadatas[start:end]
+                    ))
+            finally:
+                if pending_write is not None:
+                    await pending_write
+            
+            self.logger.info(f"Added {len(messages)} messages to vector database")
+            return ids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to add messages batch to vector database: {e}")
+            raise
+    
+    def add_messages_columns(self, columns: Dict[str, List[Any]]) -> List[str]:
+        """Add messages given column-wise (field -> list of values), embedding them in one pass."""
+        try:
+            contents = columns.get('content') or []
+            if not contents:
+                return []
+            
+            count = len(contents)
+            blanks = [''] * count
+            senders = columns.get('sender') or blanks
+            group_names = columns.get('group_name') or blanks
+            timestamps = columns.get('timestamp')
+            
+            # Same id and embedding text as _generate_message_id / _prepare_text_for_embedding
+            ids = [
+                hashlib.blake2b(f"{content}-{sender}-{timestamp}-{group_name}".encode(), digest_size=16).hexdigest()
+                for content, sender, timestamp, group_name in zip(contents, senders, timestamps or blanks, group_names)
+            ]
+            documents = [
+                f"Group: {group_name}\nSender: {sender}\nMessage: {content}"
+                for content, sender, group_name in zip(contents, senders, group_names)
+            ]
+            embeddings = self._encode_documents(documents)
+            
+            # Metadata columns, with the defaults _prepare_metadata applies
+            if timestamps is None:
+                timestamps = [datetime.now().timestamp()] * count
+            metadata_columns = {
+                'sender': senders,
+                'group_name': group_names,
+                'timestamp': [
+                    timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp
+                    for timestamp in timestamps
+                ],
+                'message_type': columns.get('message_type') or ['text'] * count,
+                'platform': columns.get('platform') or ['whatsapp'] * count,
+            }
+            for key in ('sentiment', 'category', 'priority', 'language'):
+                if key in columns:
+                    metadata_columns[key] = columns[key]
+            keys = list(metadata_columns)
+            metadatas = [dict(zip(keys, row)) for row in zip(*metadata_columns.values())]
+            
+            self._add_to_collection(ids, embeddings, documents, metadatas)
+            
+            self.logger.info(f"Added {count} messages to vector database")
+            return ids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to add message columns to vector database: {e}")
+            raise
+    
+    def _add_to_collection(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """Add prepared rows to the collection in windows of ``vector_db_add_batch_size``."""
+        step = self.settings.vector_db_add_batch_size
+        self._invalidate_count()
+        for start in range(0, len(ids), step):
+            end = start + step
+            self.collection.add(
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
+            self._index_metadata(ids[start:end], metadatas[start:end])
+    
+    def _cached_count(self) -> int:
+        """Get the collection size, reusing the last count until a write or COLLECTION_COUNT_TTL."""
+        now = time.monotonic()
+        if self._count_cache is None or now - self._count_cached_at > COLLECTION_COUNT_TTL:
+            self._count_cache = self.collection.count()
+            self._count_cached_at = now
+        return self._count_cache
+    
+    def _invalidate_count(self):
+        """Forget the cached collection size."""
+        self._count_cache = None
+    
     def search_similar_messages(
         self, 
         query: str, 
@@ -137,8 +330,8 @@ class VectorDatabaseManager:
     ) -> List[Dict[str, Any]]:
         """Search for similar messages using vector similarity."""
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            # Generate query embedding (cached per query text)
+            query_embedding = self._embed_query(query)
             
             # Search in collection
             results = self.collection.query(
@@ -176,27 +369,23 @@ class VectorDatabaseManager:
         """Search messages by metadata filters."""
         try:
             # Check if collection has any documents first
-            count = self.collection.count()
+            count = self._cached_count()
             if count == 0:
                 self.logger.debug("Collection is empty, returning empty results")
                 return []
                 
-            results = self.collection.query(
-                query_embeddings=None,
-                n_results=n_results,
-                where=where,
+            # Metadata-only lookup: get() filters without a query vector (query() requires one)
+            results = self.collection.get(
+                where=_chroma_where(where),
+                limit=n_results,
                 include=["documents", "metadatas"]
             )
             
             # Format results
-            formatted_results = []
-            if results['ids'][0]:
-                for i in range(len(results['ids'][0])):
-                    formatted_results.append({
-                        'id': results['ids'][0][i],
-                        'document': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i]
-                    })
+            formatted_results = [
+                {'id': message_id, 'document': document, 'metadata': metadata}
+                for message_id, document, metadata in zip(results['ids'], results['documents'], results['metadatas'])
+            ]
             
             self.logger.debug(f"Found {len(formatted_results)} messages matching metadata filter")
             return formatted_results
@@ -217,16 +406,12 @@ class VectorDatabaseManager:
             start_time = around_timestamp.timestamp() - (context_window_minutes * 60)
             end_time = around_timestamp.timestamp() + (context_window_minutes * 60)
             
-            # Search with metadata filters
-            where_filter = {
-                "group_name": group_name,
-                "timestamp": {"$gte": start_time, "$lte": end_time}
-            }
-            
-            results = self.search_by_metadata(where_filter, n_results=100)
-            
-            # Sort by timestamp
-            results.sort(key=lambda x: x['metadata'].get('timestamp', 0))
+            # Indexed range scan, oldest first, then fetch the matching rows from ChromaDB
+            message_ids = self._query_metadata_index(
+                "SELECT id FROM message_meta WHERE group_name = ? AND ts BETWEEN ? AND ? ORDER BY ts LIMIT 100",
+                (group_name, start_time, end_time)
+            )
+            results = self._get_messages_by_ids(message_ids)
             
             self.logger.debug(f"Retrieved {len(results)} messages for context around {around_timestamp}")
             return results
@@ -246,15 +431,12 @@ class VectorDatabaseManager:
             # Calculate time window
             cutoff_time = (datetime.now().timestamp()) - (days_back * 24 * 60 * 60)
             
-            where_filter = {
-                "sender": sender,
-                "timestamp": {"$gte": cutoff_time}
-            }
-            
-            results = self.search_by_metadata(where_filter, n_results=limit)
-            
-            # Sort by timestamp (newest first)
-            results.sort(key=lambda x: x['metadata'].get('timestamp', 0), reverse=True)
+            # Newest first
+            message_ids = self._query_metadata_index(
+                "SELECT id FROM message_meta WHERE sender = ? AND ts >= ? ORDER BY ts DESC LIMIT ?",
+                (sender, cutoff_time, limit)
+            )
+            results = self._get_messages_by_ids(message_ids)
             
             self.logger.debug(f"Retrieved {len(results)} messages for user {sender}")
             return results
@@ -263,10 +445,69 @@ class VectorDatabaseManager:
             self.logger.error(f"Failed to get user message history: {e}")
             return []
     
+    def _open_metadata_index(self):
+        """Open (and on first use backfill) the SQLite side index of message metadata."""
+        index_path = os.path.join(self.db_path, f"{self.collection_name}_metadata.db")
+        self._metadata_index = sqlite3.connect(index_path, check_same_thread=False)
+        self._metadata_index_lock = threading.Lock()
+        with self._metadata_index_lock, self._metadata_index:
+            self._metadata_index.execute("PRAGMA journal_mode=WAL")
+            for statement in _METADATA_INDEX_SCHEMA:
+                self._metadata_index.execute(statement)
+            indexed = self._metadata_index.execute("SELECT COUNT(*) FROM message_meta").fetchone()[0]
+        
+        # Collections written before the index existed
+        total = self.collection.count()
+        if indexed == 0 and total:
+            self.logger.info(f"Indexing metadata for {total} existing messages")
+            for offset in range(0, total, _METADATA_INDEX_BACKFILL_PAGE):
+                page = self.collection.get(
+                    limit=_METADATA_INDEX_BACKFILL_PAGE, offset=offset, include=["metadatas"]
+                )
+                self._index_metadata(page['ids'], page['metadatas'])
+    
+    def _index_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Mirror the searchable metadata fields of newly added messages into the side index."""
+        rows = [
+            (
+                message_id,
+                metadata.get('sender'),
+                metadata.get('group_name'),
+                metadata.get('timestamp'),
+                metadata.get('platform'),
+                metadata.get('sentiment'),
+            )
+            for message_id, metadata in zip(ids, metadatas)
+        ]
+        with self._metadata_index_lock, self._metadata_index:
+            self._metadata_index.executemany(
+                "INSERT OR REPLACE INTO message_meta VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+    
+    def _query_metadata_index(self, sql: str, parameters: tuple) -> List[str]:
+        """Run an id-returning query against the side index."""
+        with self._metadata_index_lock:
+            return [row[0] for row in self._metadata_index.execute(sql, parameters)]
+    
+    def _get_messages_by_ids(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch documents and metadata for ids, in the order given."""
+        if not message_ids:
+            return []
+        
+        fetched = self.collection.get(ids=message_ids, include=["documents", "metadatas"])
+        by_id = {
+            message_id: {'id': message_id, 'document': document, 'metadata': metadata}
+            for message_id, document, metadata in zip(fetched['ids'], fetched['documents'], fetched['metadatas'])
+        }
+        return [by_id[message_id] for message_id in message_ids if message_id in by_id]
+    
     def delete_message(self, message_id: str) -> bool:
         """Delete a message from the vector database."""
         try:
+            self._invalidate_count()
             self.collection.delete(ids=[message_id])
+            with self._metadata_index_lock, self._metadata_index:
+                self._metadata_index.execute("DELETE FROM message_meta WHERE id = ?", (message_id,))
             self.logger.debug(f"Deleted message {message_id} from vector database")
             return True
             
@@ -300,7 +541,7 @@ class VectorDatabaseManager:
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector database collection."""
         try:
-            count = self.collection.count()
+            count = self._cached_count()
             
             # Only attempt to get sample if collection has documents
             if count == 0:
@@ -345,11 +586,117 @@ class VectorDatabaseManager:
             self.logger.error(f"Failed to get collection stats: {e}")
             return {'error': str(e)}
     
+    @property
+    def embedding_model(self) -> SentenceTransformer:
+        """The embedding model, loaded on first access so metadata-only operations never pay for it."""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    model = SentenceTransformer(
+                        self.settings.embedding_model, device=self.device, **self._backend_kwargs()
+                    )
+                    if self.device.startswith("cuda") and self.settings.embedding_backend == "torch":
+                        model.half()  # FP16 roughly doubles tensor-core throughput
+                        self._pad_for_tensor_cores(model)
+                    self.logger.info(
+                        f"Embedding model {self.settings.embedding_model} loaded on {self.device} "
+                        f"({self.settings.embedding_backend} backend)"
+                    )
+                    self._embedding_model = model
+        return self._embedding_model
+    
+    def _backend_kwargs(self) -> Dict[str, Any]:
+        """SentenceTransformer arguments selecting a non-PyTorch inference backend, if configured."""
+        if self.settings.embedding_backend == "torch":
+            return {}
+        
+        kwargs: Dict[str, Any] = {"backend": self.settings.embedding_backend}
+        if self.settings.embedding_model_file:
+            kwargs["model_kwargs"] = {"file_name": self.settings.embedding_model_file}
+        return kwargs
+    
+    def _pad_for_tensor_cores(self, model: SentenceTransformer):
+        """Pad tokenized batches to a multiple of TENSOR_CORE_PAD_MULTIPLE tokens."""
+        transformer = model[0]
+        processing_kwargs = getattr(transformer, "processing_kwargs", None)
+        if processing_kwargs is None:
+            # Older sentence-transformers releases have no per-module tokenizer kwargs
+            self.logger.debug("Tokenizer padding is not configurable; sequences left unpadded")
+            return
+        
+        processing_kwargs.setdefault("text", {})["pad_to_multiple_of"] = TENSOR_CORE_PAD_MULTIPLE
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Embed a single search query."""
+        return self.embedding_model.encode(query, convert_to_numpy=True).astype(np.float32, copy=False)
+    
+    def query_cache_info(self):
+        """Get hit/miss statistics for the query embedding cache."""
+        return self._embed_query.cache_info()
+    
+    def _get_encode_pool(self):
+        """Start the multi-process encoding pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self.embedding_model.start_multi_process_pool(
+                    target_devices=["cpu"] * self._pool_size
+                )
+                atexit.register(self.stop_encode_pool)
+                self.logger.info(f"Started {self._pool_size} embedding worker processes")
+            return self._pool
+    
+    def stop_encode_pool(self):
+        """Stop the multi-process encoding pool, if it was started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self.embedding_model.stop_multi_process_pool(self._pool)
+                self._pool = None
+                atexit.unregister(self.stop_encode_pool)
+    
+    def _encode_documents(self, documents: List[str]) -> np.ndarray:
+        """Embed a list of texts, encoding each distinct text not seen recently exactly once."""
+        with self._document_embeddings_lock:
+            known = {}
+            for text in documents:
+                vector = self._document_embeddings.get(text)
+                if vector is not None:
+                    self._document_embeddings.move_to_end(text)
+                    known[text] = vector
+        
+        missing = [text for text in dict.fromkeys(documents) if text not in known]
+        if missing:
+            # Copied rows, so a cached vector doesn't keep its whole batch matrix alive
+            encoded = {text: row.copy() for text, row in zip(missing, self._encode_texts(missing))}
+            known.update(encoded)
+            
+            with self._document_embeddings_lock:
+                self._document_embeddings.update(encoded)
+                while len(self._document_embeddings) > DOCUMENT_EMBEDDING_CACHE_SIZE:
+                    self._document_embeddings.popitem(last=False)
+        
+        # One float32 row per document; ChromaDB takes the matrix without per-float boxing
+        return np.stack([known[text] for text in documents])
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Run the embedding model over texts in batches of ``self.batch_size``."""
+        if self._pool_size and len(texts) >= MULTI_PROCESS_MIN_BATCH:
+            embeddings = self.embedding_model.encode_multi_process(
+                texts, self._get_encode_pool(), batch_size=self.batch_size
+            )
+        else:
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+        return embeddings.astype(np.float32, copy=False)
+    
     def _generate_message_id(self, message_data: Dict[str, Any]) -> str:
         """Generate a unique ID for a message."""
         # Create a hash based on message content, sender, and timestamp
         content = f"{message_data.get('content', '')}-{message_data.get('sender', '')}-{message_data.get('timestamp', '')}-{message_data.get('group_name', '')}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
     
     def _prepare_text_for_embedding(self, message_data: Dict[str, Any]) -> str:
         """Prepare text content for embedding generation."""
@@ -362,12 +709,20 @@ class VectorDatabaseManager:
         
         return text_for_embedding
     
-    def _prepare_metadata(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare metadata for storage."""
+    def _prepare_metadata(self, message_data: Dict[str, Any], default_timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """Prepare metadata for storage (``default_timestamp`` fills in a missing timestamp, else now)."""
+        # Store the timestamp as epoch seconds so it stays JSON serializable and range-queryable
+        if 'timestamp' in message_data:
+            timestamp = message_data['timestamp']
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.timestamp()
+        else:
+            timestamp = default_timestamp if default_timestamp is not None else datetime.now().timestamp()
+        
         metadata = {
             'sender': message_data.get('sender', ''),
             'group_name': message_data.get('group_name', ''),
-            'timestamp': message_data.get('timestamp', datetime.now().timestamp()),
+            'timestamp': timestamp,
             'message_type': message_data.get('message_type', 'text'),
             'platform': message_data.get('platform', 'whatsapp'),
         }
@@ -385,21 +740,19 @@ class VectorDatabaseManager:
         if 'language' in message_data:
             metadata['language'] = message_data['language']
         
-        # Ensure all values are JSON serializable
-        for key, value in metadata.items():
-            if isinstance(value, datetime):
-                metadata[key] = value.timestamp()
-        
         return metadata
     
     def reset_collection(self) -> bool:
         """Reset the entire collection (use with caution)."""
         try:
+            self._invalidate_count()
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
                 metadata={"description": "WhatsApp conversations and messages"}
             )
+            with self._metadata_index_lock, self._metadata_index:
+                self._metadata_index.execute("DELETE FROM message_meta")
             self.logger.warning(f"Reset collection: {self.collection_name}")
             return True
             
@@ -408,10 +761,8 @@ class VectorDatabaseManager:
             return False
 
 
-# Global vector database manager instance
-vector_db = VectorDatabaseManager()
-
-
+# Built on first use so importing this module opens no database
+@lru_cache(maxsize=1)
 def get_vector_db() -> VectorDatabaseManager:
     """Get the global vector database manager."""
-    return vector_db
+    return VectorDatabaseManager()
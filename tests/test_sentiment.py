@@ -4,17 +4,22 @@ Basic tests for the Social Agent system.
 
 import pytest
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import numpy as np
 
 from src.agents.sentiment import SentimentAnalysisAgent
 from src.models import SentimentType
+from src.utils.config import get_settings, get_platform_config
+from src.utils.vector_db import VectorDatabaseManager
 
 
 class TestSentimentAnalysisAgent:
     """Test the sentiment analysis agent."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def agent(self):
+        # The agent keeps no per-call state (scores live in a shared cache), so one instance serves every test
         return SentimentAnalysisAgent()
     
     @pytest.mark.asyncio
@@ -76,6 +81,18 @@ class TestSentimentAnalysisAgent:
         assert "error" in result
         assert result["post_id"] == "test_empty"
     
+    @pytest.mark.asyncio
+    async def test_repeated_text_uses_cache(self, agent):
+        """Test that repeated texts reuse the cached analysis across agents."""
+        hits_before = agent.cache_info().hits
+        first = await agent.process({"text": "Thanks, great work!", "post_id": "a", "platform": "whatsapp"})
+        second = await SentimentAnalysisAgent().process({"text": "Thanks, great work!", "post_id": "b", "platform": "whatsapp"})
+        
+        assert agent.cache_info().hits == hits_before + 1
+        assert first["post_id"] == "a"
+        assert second["post_id"] == "b"
+        assert second["sentiment"] == first["sentiment"]
+    
     @pytest.mark.asyncio
     async def test_batch_analysis(self, agent):
         """Test batch sentiment analysis."""
@@ -90,6 +107,25 @@ class TestSentimentAnalysisAgent:
         assert len(results) == 3
         assert all("sentiment" in result for result in results)
     
+    @pytest.fixture(params=[3, 100, 1000])
+    def posts(self, request):
+        """Synthetic posts with distinct texts, so every one is actually scored."""
+        words = ["great", "terrible", "okay"]
+        # The score cache is shared across runs, so the texts carry the batch size too
+        return [
+            {"text": f"Post {i} of {request.param}: the service was {words[i % 3]} today", "post_id": str(i), "platform": "twitter"}
+            for i in range(request.param)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_analysis(self, agent, posts):
+        """Test many posts analyzed concurrently."""
+        results = await asyncio.gather(*(agent.process(post) for post in posts))
+        
+        assert len(results) == len(posts)
+        assert [result["post_id"] for result in results] == [post["post_id"] for post in posts]
+        assert all("sentiment" in result for result in results)
+    
     @pytest.mark.asyncio
     async def test_sentiment_summary(self, agent):
         """Test sentiment summary generation."""
@@ -109,5 +145,66 @@ class TestSentimentAnalysisAgent:
         assert summary["overall_sentiment"] == SentimentType.POSITIVE
 
 
+class TestVectorMetadataIndex:
+    """Test the metadata side index behind the vector database time-window lookups."""
+    
+    @pytest.fixture
+    def vector_db(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_settings(), "vector_db_path", str(tmp_path))
+        db = VectorDatabaseManager()
+        # Fixed vectors keep the test off the embedding model
+        monkeypatch.setattr(db, "_encode_texts", lambda texts: np.ones((len(texts), 4), dtype=np.float32))
+        return db
+    
+    @pytest.fixture
+    def now(self, vector_db):
+        now = datetime.now().replace(microsecond=0)
+        vector_db.add_messages_batch([
+            {"content": f"message {minutes}", "sender": "ann" if minutes % 2 else "bob",
+             "group_name": "team", "timestamp": now - timedelta(minutes=minutes)}
+            for minutes in (3, 0, 4, 1, 2)
+        ])
+        return now
+    
+    def test_context_is_oldest_first(self, vector_db, now):
+        """Test that conversation context comes back in chronological order."""
+        results = vector_db.get_conversation_context("team", now - timedelta(minutes=2), context_window_minutes=1)
+        
+        assert [result["metadata"]["timestamp"] for result in results] == [
+            (now - timedelta(minutes=minutes)).timestamp() for minutes in (3, 2, 1)
+        ]
+    
+    def test_history_is_newest_first(self, vector_db, now):
+        """Test that a user's history is newest first and respects the limit."""
+        results = vector_db.get_user_message_history("bob", limit=2)
+        
+        assert [result["document"].rsplit(": ", 1)[1] for result in results] == ["message 0", "message 2"]
+    
+    def test_delete_and_reset_update_index(self, vector_db, now):
+        """Test that deletes and resets are reflected in indexed lookups."""
+        newest = vector_db.get_user_message_history("bob")[0]
+        assert vector_db.delete_message(newest["id"])
+        assert newest["id"] not in [result["id"] for result in vector_db.get_user_message_history("bob")]
+        
+        assert vector_db.reset_collection()
+        assert vector_db.get_user_message_history("ann") == []
+        assert vector_db.get_conversation_context("team", now) == []
+    
+    def test_search_by_metadata(self, vector_db, now):
+        """Test metadata-only search and the stats built on it."""
+        assert len(vector_db.search_by_metadata({"sender": "ann"})) == 2
+        
+        stats = vector_db.get_collection_stats()
+        assert stats["unique_groups"] == 1
+        assert stats["unique_senders"] == 2
+
+
+def test_settings_are_shared():
+    """Test that the config accessors return one shared instance."""
+    assert get_settings() is get_settings()
+    assert get_platform_config() is get_platform_config()
+    assert get_platform_config().settings is get_settings()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])